@@ -1,15 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from flaresolverr_session.adapter import Adapter
-from flaresolverr_session.detection import is_cloudflare_challenge
-from flaresolverr_session.exceptions import (
-    FlareSolverrError,
-    FlareSolverrResponseError,
-    FlareSolverrChallengeError,
-    FlareSolverrUnsupportedMethodError,
-)
-from flaresolverr_session.rpc import RPC
-from flaresolverr_session.session import Session, Response
+import sys
 
 __title__ = "flaresolverr-session"
 __description__ = "A requests.Session that proxies through a FlareSolverr instance."
@@ -30,3 +21,44 @@ __all__ = [
     "FlareSolverrUnsupportedMethodError",
     "__version__",
 ]
+
+#: Public names and the submodules defining them.  They are imported on
+#: first access so that e.g. ``flaresolverr-cli --help`` does not pay for
+#: importing ``requests``.
+_LAZY_ATTRIBUTES = {
+    "Adapter": "flaresolverr_session.adapter",
+    "is_cloudflare_challenge": "flaresolverr_session.detection",
+    "FlareSolverrError": "flaresolverr_session.exceptions",
+    "FlareSolverrResponseError": "flaresolverr_session.exceptions",
+    "FlareSolverrChallengeError": "flaresolverr_session.exceptions",
+    "FlareSolverrUnsupportedMethodError": "flaresolverr_session.exceptions",
+    "RPC": "flaresolverr_session.rpc",
+    "Session": "flaresolverr_session.session",
+    "Response": "flaresolverr_session.session",
+}
+
+if sys.version_info >= (3, 7):
+    import importlib
+
+    def __getattr__(name):
+        module = _LAZY_ATTRIBUTES.get(name)
+        if module is None:
+            raise AttributeError("module %r has no attribute %r" % (__name__, name))
+        value = getattr(importlib.import_module(module), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+else:  # pragma: no cover - module __getattr__ requires Python 3.7
+    from flaresolverr_session.adapter import Adapter
+    from flaresolverr_session.detection import is_cloudflare_challenge
+    from flaresolverr_session.exceptions import (
+        FlareSolverrError,
+        FlareSolverrResponseError,
+        FlareSolverrChallengeError,
+        FlareSolverrUnsupportedMethodError,
+    )
+    from flaresolverr_session.rpc import RPC
+    from flaresolverr_session.session import Session, Response
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import threading
 import time
 import warnings
+from collections import OrderedDict
 
 try:
     from urlparse import urlparse, urlunparse
@@ -19,6 +21,8 @@ from flaresolverr_session.rpc import RPC
 
 logger = logging.getLogger(__name__)
 
+_UNSET = object()
+
 
 class Adapter(BaseAdapter):
     """A ``requests`` transport adapter that retries requests blocked by
@@ -75,6 +79,10 @@ class Adapter(BaseAdapter):
         # Per-site caches keyed by hostname.
         self._cf_cookies = {}
         self._user_agents = {}
+        # Per-site solve coordination, so that concurrent requests blocked
+        # by the same challenge trigger a single FlareSolverr solve.
+        self._solve_locks = {}
+        self._solve_errors = {}
 
     def send(
         self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
@@ -88,13 +96,21 @@ class Adapter(BaseAdapter):
         )
 
         self._log(logging.DEBUG, "Adapter received request", request)
-        self._prepare_request(request)
+        # Parsed once and shared by the helpers below.
+        parsed = urlparse(request.url)
+        domain = _get_root_domain(parsed.hostname)
+        sent_jar = self._cf_cookies.get(domain)
+        incoming = self._apply_cf_cookies(request, domain)
+        self._apply_user_agent(request, domain)
         response = self._base_adapter.send(request, **kwargs)
 
         if is_cloudflare_challenge(response):
             self._log(logging.DEBUG, "Challenge detected", request)
-            self._solve_challenge(request.url, proxies=proxies)
-            self._prepare_request(request)
+            self._solve_challenge(
+                request.url, proxies=proxies, parsed=parsed, stale_jar=sent_jar
+            )
+            self._apply_cf_cookies(request, domain, incoming)
+            self._apply_user_agent(request, domain)
             response = self._base_adapter.send(request, **kwargs)
             if is_cloudflare_challenge(response):
                 self._log(
@@ -107,38 +123,80 @@ class Adapter(BaseAdapter):
 
         return response
 
-    def _prepare_request(self, request):
-        parsed = urlparse(request.url)
-        domain = _get_root_domain(parsed.hostname)
-
+    def _apply_cf_cookies(self, request, domain, incoming=None):
+        """Merge the cached clearance cookies of *domain* into the
+        ``Cookie`` header of *request*.
+
+        Parameters:
+            request (requests.PreparedRequest): The outgoing request.
+            domain (str): Root domain of the request.
+            incoming (OrderedDict or None): The caller's own cookies as
+                returned by a previous call for the same request.  When
+                *None*, they are parsed from the current header.
+
+        Returns:
+            OrderedDict or None: The caller's own cookies, or *None* if
+            there was nothing to merge.
+        """
         jar = self._cf_cookies.get(domain)
-        if jar:
-            # Merge cookies into the Cookie header.
-            existing = RequestsCookieJar()
-            # Parse existing Cookie header if present.
-            cookie_header = request.headers.get("Cookie")
-            if cookie_header:
-                for pair in cookie_header.split(";"):
-                    pair = pair.strip()
-                    if "=" in pair:
-                        name, value = pair.split("=", 1)
-                        existing.set(name.strip(), value.strip())
-            for cookie in jar:
-                if cookie.expires is not None and cookie.expires < time.time():
-                    continue
-                existing.set(cookie.name, cookie.value)
-
-            # Re-build Cookie header.
-            cookie_str = "; ".join("%s=%s" % (c.name, c.value) for c in existing)
-            if cookie_str:
-                request.headers["Cookie"] = cookie_str
-
+        if not jar:
+            return incoming
+
+        if incoming is None:
+            incoming = _parse_cookie_header(request.headers.get("Cookie"))
+        # A plain mapping is enough here; the header carries no domain or
+        # path scoping.
+        merged = OrderedDict(incoming)
+        now = time.time()
+        for cookie in jar:
+            if cookie.expires is not None and cookie.expires < now:
+                continue
+            merged[cookie.name] = cookie.value
+
+        # Re-build Cookie header.
+        cookie_str = "; ".join("%s=%s" % item for item in merged.items())
+        if cookie_str:
+            request.headers["Cookie"] = cookie_str
+        return incoming
+
+    def _apply_user_agent(self, request, domain):
         user_agent = self._user_agents.get(domain)
         if user_agent:
             request.headers["User-Agent"] = user_agent
 
-    def _solve_challenge(self, original_url, proxies=None):
-        challenge_url = self._get_challenge_url(original_url)
+    def _solve_challenge(
+        self, original_url, proxies=None, parsed=None, stale_jar=_UNSET
+    ):
+        """Solve the challenge for the site of *original_url*.
+
+        Solves are serialised per site.  If the cookies the blocked request
+        was sent with (*stale_jar*) were replaced by another thread in the
+        meantime, that solve is reused.  A solve that failed while waiting
+        is re-raised instead of retried.
+        """
+        if parsed is None:
+            parsed = urlparse(original_url)
+        # Cloudflare cookies are scoped per zone (root domain)
+        domain = _get_root_domain(parsed.hostname)
+
+        failed = self._solve_errors.get(domain)
+        lock = self._solve_locks.setdefault(domain, threading.Lock())
+        with lock:
+            jar = self._cf_cookies.get(domain)
+            if stale_jar is not _UNSET and jar is not stale_jar:
+                return
+            error = self._solve_errors.get(domain)
+            if error is not None and error is not failed:
+                raise error
+            try:
+                self._request_solution(original_url, domain, parsed, proxies)
+            except Exception as exc:
+                self._solve_errors[domain] = exc
+                raise
+            self._solve_errors.pop(domain, None)
+
+    def _request_solution(self, original_url, domain, parsed, proxies=None):
+        challenge_url = self._get_challenge_url(original_url, parsed)
         rpc_kwargs = {"url": challenge_url, "return_only_cookies": True}
 
         if proxies:
@@ -149,9 +207,6 @@ class Adapter(BaseAdapter):
         data = self._rpc.request.get(**rpc_kwargs)
         solution = data.get("solution", {})
 
-        # Cloudflare cookies are scoped per zone (root domain)
-        domain = _get_root_domain(urlparse(original_url).hostname)
-
         user_agent = solution.get("userAgent")
         if user_agent:
             self._user_agents[domain] = user_agent
@@ -167,12 +222,13 @@ class Adapter(BaseAdapter):
                 break
         self._cf_cookies[domain] = jar
 
-    def _get_challenge_url(self, original_url):
+    def _get_challenge_url(self, original_url, parsed=None):
         if self._challenge_url is None:
             return original_url
 
         if self._challenge_url.startswith("/"):
-            parsed = urlparse(original_url)
+            if parsed is None:
+                parsed = urlparse(original_url)
             return urlunparse(
                 (parsed.scheme, parsed.netloc, self._challenge_url, "", "", "")
             )
@@ -192,3 +248,13 @@ class Adapter(BaseAdapter):
 def _get_root_domain(hostname):
     parts = hostname.split(".")
     return ".".join(parts[-2:])
+
+
+def _parse_cookie_header(header):
+    cookies = OrderedDict()
+    if header:
+        for pair in header.split(";"):
+            name, sep, value = pair.partition("=")
+            if sep:
+                cookies[name.strip()] = value.strip()
+    return cookies
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import os
+
+import aiohttp
+
+from flaresolverr_session.exceptions import FlareSolverrResponseError
+from flaresolverr_session.rpc import RequestCommand, SessionCommand, _loads
+
+__all__ = [
+    "AsyncRPC",
+    "AsyncRequestCommand",
+]
+
+
+class AsyncRPC(object):
+    """Asynchronous RPC client for FlareSolverr based on ``aiohttp``.
+
+    Exposes the same :attr:`session` and :attr:`request` namespaces as
+    :class:`~flaresolverr_session.rpc.RPC`, but every command returns an
+    awaitable resolving to the FlareSolverr response dict, so many calls
+    can be in flight at once::
+
+        async with AsyncRPC() as rpc:
+            results = await asyncio.gather(
+                *[rpc.request.get(url) for url in urls]
+            )
+
+    Requires the optional ``aiohttp`` dependency
+    (``pip install flaresolverr-session[async]``).
+
+    Parameters:
+        flaresolverr_url (str): The FlareSolverr API endpoint
+            (e.g. ``"http://localhost:8191/v1"``).
+        api_session (aiohttp.ClientSession or None): Session object used
+            to communicate with the FlareSolverr instance.  When *None*,
+            one is created on first use and closed by :meth:`close`.
+    """
+
+    #: Maximum number of simultaneous connections to the FlareSolverr host.
+    LIMIT_PER_HOST = 64
+
+    def __init__(self, flaresolverr_url=None, api_session=None):
+        if flaresolverr_url is None:
+            flaresolverr_url = os.environ.get(
+                "FLARESOLVERR_URL", "http://localhost:8191/v1"
+            )
+
+        self._flaresolverr_url = flaresolverr_url
+        self._api_session = api_session
+        self._owns_api_session = api_session is None
+        self.session = SessionCommand(self)
+        self.request = AsyncRequestCommand(self)
+
+    async def send(self, payload):
+        """Send a JSON payload to the FlareSolverr endpoint.
+
+        Parameters:
+            payload (dict): The JSON-serialisable payload to send.
+
+        Returns:
+            dict: The parsed JSON response from FlareSolverr.
+
+        Raises:
+            FlareSolverrResponseError: If the response status is
+                not ``"ok"``.
+        """
+        if self._api_session is None:
+            # Created lazily so that it is bound to the running event loop.
+            self._api_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=0, limit_per_host=self.LIMIT_PER_HOST
+                ),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10),
+            )
+        async with self._api_session.post(self._flaresolverr_url, json=payload) as resp:
+            data = await resp.json(loads=_loads, content_type=None)
+        status = data.get("status", "")
+        if status != "ok":
+            raise FlareSolverrResponseError(data.get("message"), data)
+        return data
+
+    async def close(self):
+        """Close the internal ``aiohttp`` session, if one was created."""
+        if self._owns_api_session and self._api_session is not None:
+            await self._api_session.close()
+            self._api_session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+class AsyncRequestCommand(RequestCommand):
+    """:class:`~flaresolverr_session.rpc.RequestCommand` for
+    :class:`AsyncRPC`.
+
+    ``get`` and ``post`` return awaitables; :meth:`get_many` runs the
+    requests on the event loop instead of a thread pool.  Concurrent
+    identical ``get`` calls are not coalesced.
+    """
+
+    def _send(self, cmd, payload, template_key):
+        # The thread-based coalescing of RequestCommand would share one
+        # coroutine between callers, so every call is sent on its own.
+        return self._rpc.send(payload)
+
+    async def get_many(self, urls, max_concurrency=16, **kwargs):
+        """Send GET requests for several URLs concurrently.
+
+        Parameters:
+            urls (list of str): Target URLs.
+            max_concurrency (int): Maximum number of simultaneous
+                requests.  Default 16.
+            **kwargs: Options passed to :meth:`get` for every URL.
+
+        Returns:
+            list of dict: The JSON responses, in the order of *urls*.
+
+        Raises:
+            FlareSolverrResponseError: If any of the requests fails.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(url):
+            async with semaphore:
+                return await self.get(url, **kwargs)
+
+        return list(await asyncio.gather(*[fetch(url) for url in urls]))
@@ -1,30 +1,50 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from __future__ import print_function
-
-import argparse
-import base64
+import binascii
 import json
 import os
 import sys
 
-from flaresolverr_session.rpc import RPC
-from flaresolverr_session.exceptions import FlareSolverrResponseError
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_DEFAULT_FLARESOLVERR_URL = "http://localhost:8191/v1"
+
+_parsers = {}
+
+_MAIN_HELP = """\
+usage: flaresolverr-cli [-f FLARESOLVERR_URL]
+
+Interact with a FlareSolverr instance
+
+options:
+  -f FLARESOLVERR_URL, --flaresolverr FLARESOLVERR_URL
+                        FlareSolverr API endpoint (default: FLARESOLVERR_URL
+                        env var or http://localhost:8191/v1)
+
+commands:
+  session             Manage FlareSolverr sessions
+  request (default)   Send an HTTP request through FlareSolverr
+
+Run 'flaresolverr-cli session --help' or 'flaresolverr-cli request --help' \
+for more information.
+"""
 
 
 def main(argv=None):
     if argv is None:
         argv = sys.argv[1:]
 
-    main_parser = _build_main_parser()
-
     # Handle top-level -h/--help when no command specified
     if not argv or argv == ["-h"] or argv == ["--help"]:
-        main_parser.print_help()
+        sys.stdout.write(_MAIN_HELP)
         return 0
 
-    first_args, remaining = main_parser.parse_known_args(argv)
+    flaresolverr_url, remaining = _peek_argv(argv)
 
     # Determine command from remaining args.
     if remaining and remaining[0] in ("session", "request"):
@@ -32,15 +52,38 @@ def main(argv=None):
     else:
         command = "request"
 
-    rpc = RPC(first_args.flaresolverr_url)
+    if command == "session":
+        parser = _get_parser(_build_session_parser)
+    else:
+        parser = _get_parser(_build_request_parser)
+    args = parser.parse_args(remaining)
+    if command == "request":
+        if args.input_file:
+            if args.url or args.output_file or args.screenshot:
+                parser.error(
+                    "--input-file cannot be combined with a url, "
+                    "-o/--output or --screenshot"
+                )
+        elif not args.url:
+            parser.error("a url or --input-file is required")
+
+    # Imported only once the arguments are valid, so that --help and usage
+    # errors do not pay for importing requests.
+    from flaresolverr_session.exceptions import FlareSolverrResponseError
+    from flaresolverr_session.rpc import RPC
+
+    flaresolverr_url = flaresolverr_url or os.environ.get(
+        "FLARESOLVERR_URL", _DEFAULT_FLARESOLVERR_URL
+    )
+    rpc = RPC(flaresolverr_url)
     try:
         if command == "session":
-            parser = _build_session_parser()
-            args = parser.parse_args([command] + remaining)
             res = _handle_session(rpc, args)
+        elif args.input_file:
+            res = _handle_request_batch(rpc, args)
+            format_output(res)
+            return 0 if all(r.get("status") == "ok" for r in res) else 1
         else:
-            parser = _build_request_parser()
-            args = parser.parse_args([command] + remaining)
             res = _handle_request(rpc, args)
             _truncate_response_body(res)
 
@@ -51,44 +94,67 @@ def main(argv=None):
         return 1
 
 
-def _build_main_parser():
-    parser = argparse.ArgumentParser(
-        prog="flaresolverr-cli",
-        description="Interact with a FlareSolverr instance",
-        add_help=False,
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=(
-            "commands:\n"
-            "  session             Manage FlareSolverr sessions\n"
-            "  request (default)   Send an HTTP request through FlareSolverr\n\n"
-            "Run 'flaresolverr-cli session --help' or "
-            "'flaresolverr-cli request --help' for more information."
-        ),
-    )
-    parser.add_argument(
-        "-f",
-        "--flaresolverr",
-        dest="flaresolverr_url",
-        default=os.environ.get("FLARESOLVERR_URL", "http://localhost:8191/v1"),
-        help=(
-            "FlareSolverr API endpoint (default: FLARESOLVERR_URL "
-            "env var or http://localhost:8191/v1)"
-        ),
-    )
+def _get_parser(builder):
+    """Return the parser made by *builder*, building it on first use.
+
+    Parsers are never mutated by parsing, so one instance serves every
+    :func:`main` call of the process.
+    """
+    parser = _parsers.get(builder)
+    if parser is None:
+        parser = _parsers[builder] = builder()
     return parser
 
 
+def _peek_argv(argv):
+    """Extract the global ``-f/--flaresolverr`` option from *argv*.
+
+    The option may appear anywhere before ``--``.  Scanning by hand keeps
+    argparse out of the top-level dispatch; only the parser of the chosen
+    command is ever built.  Like argparse, unique prefixes of the long
+    form (e.g. ``--flare``) are accepted.
+
+    Returns:
+        tuple: The FlareSolverr URL (or *None*) and the remaining
+        arguments.
+    """
+    flaresolverr_url = None
+    remaining = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--":
+            remaining.append(arg)
+            remaining.extend(args)
+            break
+        name, eq, value = arg.partition("=")
+        # No other option starts with "--f", so any such prefix is unique.
+        is_long = len(name) > 2 and "--flaresolverr".startswith(name)
+        if arg == "-f" or (is_long and not eq):
+            flaresolverr_url = next(args, None)
+            if flaresolverr_url is None:
+                sys.stderr.write(
+                    "usage: flaresolverr-cli [-f FLARESOLVERR_URL]\n"
+                    "flaresolverr-cli: error: argument -f/--flaresolverr: "
+                    "expected one argument\n"
+                )
+                raise SystemExit(2)
+        elif is_long:
+            flaresolverr_url = value
+        elif arg.startswith("-f") and not arg.startswith("--"):
+            flaresolverr_url = arg[2:].lstrip("=")
+        else:
+            remaining.append(arg)
+    return flaresolverr_url, remaining
+
+
 def _build_session_parser():
+    import argparse
+
     parser = argparse.ArgumentParser(
-        prog="flaresolverr-cli",
-        description="Interact with a FlareSolverr instance",
-    )
-    subparsers = parser.add_subparsers(dest="command")
-    sub_parser = subparsers.add_parser(
-        "session",
-        help="Manage FlareSolverr sessions",
+        prog="flaresolverr-cli session",
+        description="Manage FlareSolverr sessions",
     )
-    session_sub = sub_parser.add_subparsers(dest="session_action")
+    session_sub = parser.add_subparsers(dest="session_action")
     session_sub.required = True
 
     # session create
@@ -121,67 +187,78 @@ def _build_session_parser():
 
 
 def _build_request_parser():
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="flaresolverr-cli request",
         description="Send an HTTP request through FlareSolverr",
     )
-    subparsers = parser.add_subparsers(dest="command")
-    sub_parser = subparsers.add_parser(
-        "request",
-        help="Send an HTTP request through FlareSolverr",
-    )
 
-    sub_parser.add_argument(
+    parser.add_argument(
         "url",
+        nargs="?",
         help="URL to request",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
+        "-i",
+        "--input-file",
+        dest="input_file",
+        default=None,
+        help="Request every URL listed in this file (one per line) instead",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum concurrent requests with --input-file (default: 8)",
+    )
+    parser.add_argument(
         "-m",
         "--method",
         default=None,
         choices=["GET", "POST"],
         help="HTTP method (default: GET, or POST when -d is given)",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "-s",
         "--session-id",
         dest="session_id",
         default=None,
         help="FlareSolverr session id to use",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "-d",
         "--data",
         default=None,
         help="POST data (x-www-form-urlencoded)",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "-o",
         "--output",
         dest="output_file",
         default=None,
         help="Write response body to file",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "-t",
         "--timeout",
         type=int,
         default=None,
         help="Request timeout in milliseconds (default: 60000)",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "--proxy",
         default=None,
         help="Proxy URL (e.g. http://proxy:8080)",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "--session-ttl-minutes",
         dest="session_ttl_minutes",
         type=int,
         default=None,
         help="Auto-rotate sessions older than this many minutes",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "-c",
         "--cookies",
         dest="cookies",
@@ -189,20 +266,20 @@ def _build_request_parser():
         default=False,
         help="Return only cookies, omitting the response body",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "--screenshot",
         dest="screenshot",
         default=None,
         help="Write PNG screenshot of the final rendered page after all challenges and waits are completed to given path",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "--wait",
         dest="wait_in_seconds",
         type=int,
         default=None,
         help="Extra seconds to wait after the challenge is solved",
     )
-    sub_parser.add_argument(
+    parser.add_argument(
         "--disable-media",
         dest="disable_media",
         action="store_true",
@@ -219,18 +296,43 @@ def _handle_session(rpc, args):
     if action == "create":
         names = getattr(args, "name", None)
         proxy = getattr(args, "proxy", None)
-        return [rpc.session.create(session_id=n, proxy=proxy) for n in names]
+        return _map_concurrently(
+            lambda n: rpc.session.create(session_id=n, proxy=proxy), names
+        )
     elif action == "list":
         return rpc.session.list()
     elif action == "destroy":
         return rpc.session.destroy(args.session_id)
     elif action == "clear":
         payload = rpc.session.list()
-        return [rpc.session.destroy(s) for s in payload["sessions"]]
+        return _map_concurrently(rpc.session.destroy, payload["sessions"])
     else:
         raise ValueError("Unknown session action: %s" % action)
 
 
+def _map_concurrently(func, items, max_workers=16):
+    """Call *func* on every item from a thread pool.
+
+    FlareSolverr has no batch API, so independent calls are overlapped
+    instead of issued one after another.
+
+    Returns:
+        list: The results, in the order of *items*.
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+
+    from multiprocessing.pool import ThreadPool
+
+    pool = ThreadPool(min(max_workers, len(items)))
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
 def _handle_request(rpc, args):
     """Send a request through FlareSolverr and display the result.
 
@@ -238,75 +340,141 @@ def _handle_request(rpc, args):
         rpc (RPC): RPC client instance.
         args (argparse.Namespace): Parsed CLI arguments.
     """
-    method = getattr(args, "method", None)
-    data = getattr(args, "data", None)
-    if method is None:
-        method = "POST" if data else "GET"
-
-    kwargs = {}
-    session_id = getattr(args, "session_id", None)
-    if session_id:
-        kwargs["session_id"] = session_id
-    timeout = getattr(args, "timeout", None)
-    if timeout:
-        kwargs["max_timeout"] = timeout
-    proxy = getattr(args, "proxy", None)
-    if proxy:
-        kwargs["proxy"] = proxy
-    session_ttl_minutes = getattr(args, "session_ttl_minutes", None)
-    if session_ttl_minutes is not None:
-        kwargs["session_ttl_minutes"] = session_ttl_minutes
-    if getattr(args, "cookies", False):
-        kwargs["return_only_cookies"] = True
+    method, data, kwargs = _request_options(args)
     screenshot_path = getattr(args, "screenshot", None)
     if screenshot_path:
         kwargs["return_screenshot"] = True
-    wait_in_seconds = getattr(args, "wait_in_seconds", None)
-    if wait_in_seconds is not None:
-        kwargs["wait_in_seconds"] = wait_in_seconds
-    if getattr(args, "disable_media", False):
-        kwargs["disable_media"] = True
 
-    if method == "POST":
-        result = rpc.request.post(args.url, data=data, **kwargs)
-    else:
-        result = rpc.request.get(args.url, **kwargs)
+    result = _send_request(rpc, args.url, method, data, kwargs)
 
     # Write body to file if requested
     output_file = getattr(args, "output_file", None)
     if output_file:
         body = result.get("solution", {}).get("response", "")
-        if isinstance(body, bytes):
-            content = body
-        else:
-            content = body.encode("utf-8")
-        with open(output_file, "wb") as f:
-            f.write(content)
+        _write_body(output_file, body)
 
-    # Write screenshot to file if requested
-    if screenshot_path:
-        screenshot_b64 = result["solution"]["screenshot"]
-        data = base64.b64decode(screenshot_b64)
-        with open(screenshot_path, "wb") as f:
-            f.write(data)
+    # Write screenshot to file if requested; this is the only place the
+    # base64 payload is decoded.
+    screenshot_b64 = result.get("solution", {}).get("screenshot")
+    if screenshot_path and screenshot_b64:
+        _write_base64(screenshot_path, screenshot_b64)
 
     return result
 
 
+def _handle_request_batch(rpc, args):
+    """Send a request for every URL in ``args.input_file`` concurrently
+    over the one *rpc* client.
+
+    Returns:
+        list: One FlareSolverr response per URL, in file order, with long
+        bodies truncated.  Failed requests are reported by their error
+        response instead of aborting the batch.
+    """
+    from flaresolverr_session.exceptions import FlareSolverrResponseError
+
+    with open(args.input_file) as f:
+        urls = [line.strip() for line in f if line.strip()]
+    method, data, kwargs = _request_options(args)
+
+    def fetch(url):
+        try:
+            result = _send_request(rpc, url, method, data, kwargs)
+        except FlareSolverrResponseError as exc:
+            return exc.response_data
+        return _truncate_response_body(result)
+
+    return _map_concurrently(fetch, urls, max_workers=max(args.concurrency, 1))
+
+
+#: ``(argument, RPC keyword, keep_zero)`` for each request option that is
+#: forwarded when set.  Options with *keep_zero* are forwarded even when
+#: explicitly set to ``0``.
+_REQUEST_OPTIONS = (
+    ("session_id", "session_id", False),
+    ("timeout", "max_timeout", False),
+    ("proxy", "proxy", False),
+    ("session_ttl_minutes", "session_ttl_minutes", True),
+    ("cookies", "return_only_cookies", False),
+    ("wait_in_seconds", "wait_in_seconds", True),
+    ("disable_media", "disable_media", False),
+)
+
+
+def _request_options(args):
+    """Translate parsed request arguments into RPC call options.
+
+    Returns:
+        tuple: ``(method, data, kwargs)`` for :func:`_send_request`.
+    """
+    method = getattr(args, "method", None)
+    data = getattr(args, "data", None)
+    if method is None:
+        method = "POST" if data else "GET"
+
+    kwargs = {}
+    for name, keyword, keep_zero in _REQUEST_OPTIONS:
+        value = getattr(args, name, None)
+        if value or (keep_zero and value is not None):
+            kwargs[keyword] = value
+    return method, data, kwargs
+
+
+def _send_request(rpc, url, method, data, kwargs):
+    if method == "POST":
+        return rpc.request.post(url, data=data, **kwargs)
+    return rpc.request.get(url, **kwargs)
+
+
+def _write_body(path, body, chunk_size=65536):
+    """Write *body* to *path*, encoding text in chunks of *chunk_size*
+    characters so that no full encoded copy of a large page is built."""
+    with open(path, "wb") as f:
+        if isinstance(body, bytes):
+            f.write(body)
+            return
+        for start in range(0, len(body), chunk_size):
+            f.write(body[start : start + chunk_size].encode("utf-8"))
+
+
+def _write_base64(path, data, chunk_size=65536):
+    """Decode base64 *data* into *path* chunk by chunk so that the decoded
+    payload is never held in memory as a whole."""
+    chunk_size -= chunk_size % 4  # Keep chunks aligned to base64 quanta.
+    with open(path, "wb") as f:
+        for start in range(0, len(data), chunk_size):
+            f.write(binascii.a2b_base64(data[start : start + chunk_size]))
+
+
 def _truncate_response_body(data, max_length=200):
     solution = data["solution"]
     body = solution.get("response", "")
-    if len(body) > max_length:
-        solution["response"] = body[:max_length] + "...[%d letters]" % len(body)
-    if solution.get("screenshot"):
-        solution["screenshot"] = "[%d bytes of PNG data]" % len(solution["screenshot"])
+    length = len(body)
+    if length > max_length:
+        solution["response"] = "%s...[%d letters]" % (body[:max_length], length)
+    screenshot = solution.get("screenshot")
+    if screenshot:
+        solution["screenshot"] = "[%d bytes of PNG data]" % len(screenshot)
     return data
 
 
 def format_output(data, file=None):
     if file is None:
         file = sys.stdout
-    print(json.dumps(data, indent=2), file=file)
+    if orjson is not None:
+        output = orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        )
+        # orjson never escapes non-ASCII; only use it when that can't show,
+        # so the output is the same with or without orjson installed.
+        if output.isascii():
+            file.write(output.decode("ascii"))
+            return
+    # One write per document instead of print()'s separate newline write.
+    output = json.dumps(data, indent=2) + "\n"
+    if isinstance(output, bytes):  # Python 2; text streams want unicode.
+        output = output.decode("ascii")
+    file.write(output)
 
 
 if __name__ == "__main__":
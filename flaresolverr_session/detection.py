@@ -35,21 +35,59 @@ CHALLENGE_CLASSES = [
     "lds-ring",
 ]
 
-#: Compiled pattern for ``<title>`` extraction.
-_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
-
-#: Compiled pattern matching any of the known challenge ``id`` values.
-_CHALLENGE_ID_RE = re.compile(
-    r"""(?:id\s*=\s*["'])(%s)["']""" % "|".join(re.escape(i) for i in CHALLENGE_IDS),
-    re.IGNORECASE,
+#: Number of leading body bytes inspected.  Challenge and access-denied
+#: pages are a few KB, so their markers always fall well inside it, while
+#: large legitimate 403/503 pages are not scanned in full.
+SCAN_WINDOW = 65536
+
+# The patterns below work on the raw body bytes: every marker is ASCII,
+# so the body never needs to be decoded (or its charset detected).
+
+#: Lower-cased ``id`` and ``class`` tokens.  A body containing none of
+#: them cannot match the patterns below, which lets the common negative
+#: case skip both regex scans.
+_CHALLENGE_TOKENS = tuple(
+    t.lower().encode("ascii") for t in CHALLENGE_IDS + CHALLENGE_CLASSES
 )
 
-#: Compiled pattern matching any of the known challenge ``class`` values.
-_CHALLENGE_CLASS_RE = re.compile(
-    r"""(?:class\s*=\s*["'][^"']*)(%s)"""
-    % "|".join(re.escape(c) for c in CHALLENGE_CLASSES),
-    re.IGNORECASE,
-)
+#: Lower-cased titles, see :data:`CHALLENGE_TITLES` and
+#: :data:`ACCESS_DENIED_TITLES`.
+_CHALLENGE_TITLES = tuple(t.lower().encode("ascii") for t in CHALLENGE_TITLES)
+_ACCESS_DENIED_TITLES = tuple(t.lower().encode("ascii") for t in ACCESS_DENIED_TITLES)
+
+#: Compiled ``(title, id, class)`` patterns, see :func:`_get_patterns`.
+_PATTERNS = None
+
+
+def _get_patterns():
+    """Return the compiled detection patterns, compiling them on first use.
+
+    Detection only runs for 403/503 responses, so compilation is deferred
+    until then rather than paid on import.
+
+    Returns:
+        tuple: The ``<title>`` extraction pattern and the patterns matching
+        any of the known challenge ``id`` and ``class`` values.
+    """
+    global _PATTERNS
+    if _PATTERNS is None:
+        title_re = re.compile(b"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+        id_re = re.compile(
+            (
+                r"""(?:id\s*=\s*["'])(%s)["']"""
+                % "|".join(re.escape(i) for i in CHALLENGE_IDS)
+            ).encode("ascii"),
+            re.IGNORECASE,
+        )
+        class_re = re.compile(
+            (
+                r"""(?:class\s*=\s*["'][^"']*)(%s)"""
+                % "|".join(re.escape(c) for c in CHALLENGE_CLASSES)
+            ).encode("ascii"),
+            re.IGNORECASE,
+        )
+        _PATTERNS = (title_re, id_re, class_re)
+    return _PATTERNS
 
 
 def is_cloudflare_challenge(response):
@@ -64,21 +102,30 @@ def is_cloudflare_challenge(response):
     if response.status_code not in CLOUDFLARE_STATUS_CODES:
         return False
 
-    body = response.text
+    # Challenge pages are always HTML; skip decoding and scanning the body
+    # of e.g. JSON API errors.
+    content_type = response.headers.get("Content-Type")
+    if content_type and "html" not in content_type.lower():
+        return False
+
+    body = (response.content or b"")[:SCAN_WINDOW]
+    title_re, id_re, class_re = _get_patterns()
 
-    title_match = _TITLE_RE.search(body)
+    title_match = title_re.search(body)
     if title_match:
-        page_title = title_match.group(1).strip()
-        for title in CHALLENGE_TITLES:
-            if title.lower() == page_title.lower():
-                return True
-        for title in ACCESS_DENIED_TITLES:
-            if page_title.lower().startswith(title.lower()):
-                return True
-
-    if _CHALLENGE_ID_RE.search(body):
+        page_title = title_match.group(1).strip().lower()
+        if page_title in _CHALLENGE_TITLES:
+            return True
+        if page_title.startswith(_ACCESS_DENIED_TITLES):
+            return True
+
+    lowered = body.lower()
+    if not any(token in lowered for token in _CHALLENGE_TOKENS):
+        return False
+
+    if id_re.search(body):
         return True
-    if _CHALLENGE_CLASS_RE.search(body):
+    if class_re.search(body):
         return True
 
     return False
@@ -1,14 +1,31 @@
 # -*- coding: utf-8 -*-
 
+import copy
 import json
 import os
+import threading
+from multiprocessing.pool import ThreadPool
 
 try:
     from urllib import urlencode
 except ImportError:
     from urllib.parse import urlencode
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from flaresolverr_session.exceptions import FlareSolverrResponseError
 
@@ -18,6 +35,12 @@ __all__ = [
     "RequestCommand",
 ]
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+#: Maximum number of memoised query strings, see :func:`_urlencode`.
+_URLENCODE_CACHE_SIZE = 1024
+_urlencode_cache = {}
+
 
 class RPC(object):
     """RPC client for FlareSolverr.
@@ -31,9 +54,20 @@ class RPC(object):
         flaresolverr_url (str): The FlareSolverr API endpoint
             (e.g. ``"http://localhost:8191/v1"``).
         api_session (requests.Session or None): Session object used to
-            communicate with the FlareSolverr instance.
+            communicate with the FlareSolverr instance.  When *None*, a
+            session with a connection pool sized for concurrent calls
+            (see :attr:`POOL_MAXSIZE`) that retries failed connection
+            attempts (see :attr:`CONNECT_RETRIES`) is created.
     """
 
+    #: Number of keep-alive connections kept open to the FlareSolverr host.
+    POOL_MAXSIZE = 64
+
+    #: Number of times a failed connection attempt is retried.  Only
+    #: connect errors are retried: the request has not reached
+    #: FlareSolverr yet, so it is safe even for a challenge-solving POST.
+    CONNECT_RETRIES = 2
+
     def __init__(self, flaresolverr_url=None, api_session=None):
         if flaresolverr_url is None:
             flaresolverr_url = os.environ.get(
@@ -41,6 +75,20 @@ class RPC(object):
             )
         if api_session is None:
             api_session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_maxsize=self.POOL_MAXSIZE,
+                max_retries=Retry(
+                    total=self.CONNECT_RETRIES,
+                    connect=self.CONNECT_RETRIES,
+                    read=0,
+                    redirect=0,
+                    status=0,
+                    other=0,
+                    backoff_factor=0.2,
+                ),
+            )
+            api_session.mount("http://", adapter)
+            api_session.mount("https://", adapter)
 
         self._flaresolverr_url = flaresolverr_url
         self._api_session = api_session
@@ -60,13 +108,14 @@ class RPC(object):
             FlareSolverrResponseError: If the response status is
                 not ``"ok"``.
         """
-        headers = {"Content-Type": "application/json"}
+        # The body is passed as ready-made bytes (rather than ``json=``)
+        # so requests sends it without re-serialising or re-encoding it.
         resp = self._api_session.post(
             self._flaresolverr_url,
-            headers=headers,
-            data=json.dumps(payload),
+            headers=_JSON_HEADERS,
+            data=_dumps(payload),
         )
-        data = resp.json()
+        data = _loads(resp.content)
         status = data.get("status", "")
         if status != "ok":
             raise FlareSolverrResponseError(data.get("message"), data, response=resp)
@@ -111,11 +160,9 @@ class SessionCommand(object):
         payload = {"cmd": "sessions.create"}
         if session_id:
             payload["session"] = session_id
+        proxy = _normalize_proxy(proxy)
         if proxy:
-            if isinstance(proxy, dict):
-                payload["proxy"] = proxy
-            else:
-                payload["proxy"] = {"url": proxy}
+            payload["proxy"] = proxy
         return self._rpc.send(payload)
 
     def list(self):
@@ -165,14 +212,26 @@ class SessionCommand(object):
 class RequestCommand(object):
     """Send HTTP requests through a FlareSolverr instance.
 
+    Identical ``request.get`` calls issued concurrently (e.g. from
+    several threads) are coalesced: only the first one reaches
+    FlareSolverr and the others receive a copy of its result.
+
     Parameters:
         rpc (RPC): The parent RPC instance.
     """
 
     DEFAULT_TIMEOUT = 60000
 
+    #: Maximum number of cached payload templates, see :meth:`_request`.
+    MAX_TEMPLATES = 32
+
     def __init__(self, rpc):
         self._rpc = rpc
+        # Payload skeletons keyed by the request options.
+        self._templates = {}
+        # In-flight GET calls keyed by their options, url and cookies.
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
 
     def get(
         self,
@@ -273,6 +332,34 @@ class RequestCommand(object):
             tabs_till_verify=tabs_till_verify,
         )
 
+    def get_many(self, urls, max_concurrency=16, **kwargs):
+        """Send GET requests for several URLs concurrently.
+
+        The requests share the RPC's pooled api session, so up to
+        *max_concurrency* of them are in flight at once.
+
+        Parameters:
+            urls (list of str): Target URLs.
+            max_concurrency (int): Maximum number of simultaneous
+                requests.  Default 16.
+            **kwargs: Options passed to :meth:`get` for every URL.
+
+        Returns:
+            list of dict: The JSON responses, in the order of *urls*.
+
+        Raises:
+            FlareSolverrResponseError: If any of the requests fails.
+        """
+        urls = list(urls)
+        if not urls:
+            return []
+        pool = ThreadPool(min(max_concurrency, len(urls)))
+        try:
+            return pool.map(lambda url: self.get(url, **kwargs), urls)
+        finally:
+            pool.close()
+            pool.join()
+
     def post(
         self,
         url,
@@ -295,7 +382,9 @@ class RequestCommand(object):
         Parameters:
             url (str): Target URL.
             data (str, dict or None): POST body.  A *dict* is
-                automatically URL-encoded.
+                automatically URL-encoded (list values become repeated
+                fields); a *str* is sent as-is, so a form posted
+                repeatedly can be encoded once by the caller.
             session_id (str or None): Use an existing session.
             max_timeout (int or None): Max timeout in **ms**.
             proxy (str, dict or None): Proxy specification.
@@ -368,37 +457,232 @@ class RequestCommand(object):
         Returns:
             dict: The JSON response from FlareSolverr.
         """
-        payload = {
+        if isinstance(proxy, dict):
+            proxy_key = tuple(sorted(proxy.items()))
+        else:
+            proxy_key = proxy
+        key = (
+            cmd,
+            session_id,
+            max_timeout,
+            proxy_key,
+            session_ttl_minutes,
+            return_only_cookies,
+            return_screenshot,
+            wait_in_seconds,
+            disable_media,
+            tabs_till_verify,
+        )
+        template = self._templates.get(key)
+        if template is None:
+            if len(self._templates) >= self.MAX_TEMPLATES:
+                self._templates.clear()
+            template = self._templates[key] = self._make_template(
+                cmd,
+                session_id=session_id,
+                max_timeout=max_timeout,
+                proxy=proxy,
+                session_ttl_minutes=session_ttl_minutes,
+                return_only_cookies=return_only_cookies,
+                return_screenshot=return_screenshot,
+                wait_in_seconds=wait_in_seconds,
+                disable_media=disable_media,
+                tabs_till_verify=tabs_till_verify,
+            )
+
+        payload = dict(template)
+        payload["url"] = url
+        if cookies:
+            payload["cookies"] = cookies
+        if cmd == "request.post":
+            payload["postData"] = _encode_post_data(data)
+        return self._send(cmd, payload, key)
+
+    def _send(self, cmd, payload, template_key):
+        """Send *payload*, coalescing ``request.get`` calls.
+
+        Parameters:
+            cmd (str): FlareSolverr command.
+            payload (dict): The request payload.
+            template_key (tuple): The options key of the payload's
+                template, see :meth:`_request`.
+
+        Returns:
+            dict: The JSON response from FlareSolverr.
+        """
+        if cmd == "request.get":
+            return self._send_coalesced(payload, template_key)
+        return self._rpc.send(payload)
+
+    def _send_coalesced(self, payload, template_key):
+        """Send *payload*, sharing the result with identical in-flight calls.
+
+        Parameters:
+            payload (dict): The ``request.get`` payload.
+            template_key (tuple): The options key of the payload's
+                template; together with the url and cookies it identifies
+                the payload without serialising it.
+
+        Returns:
+            dict: The JSON response from FlareSolverr.
+        """
+        try:
+            key = (template_key, payload["url"], _cookies_key(payload.get("cookies")))
+            hash(key)
+        except TypeError:  # Unhashable cookie values; send uncoalesced.
+            return self._rpc.send(payload)
+
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._inflight[key] = _InflightCall()
+
+        if not is_leader:
+            return call.wait()
+
+        try:
+            call.result = self._rpc.send(payload)
+        except Exception as e:
+            call.exception = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            call.done.set()
+        # The leader gets a copy too, so no caller can mutate call.result
+        # while the waiters are still copying it.
+        return call.wait()
+
+    def _make_template(
+        self,
+        cmd,
+        session_id=None,
+        max_timeout=None,
+        proxy=None,
+        session_ttl_minutes=None,
+        return_only_cookies=False,
+        return_screenshot=False,
+        wait_in_seconds=None,
+        disable_media=False,
+        tabs_till_verify=None,
+    ):
+        """Build the per-request-independent part of a request payload.
+
+        The result is cached by :meth:`_request` and must not be mutated;
+        see :meth:`_request` for the parameters.
+
+        Returns:
+            dict: A payload without the ``url``, ``cookies`` and
+            ``postData`` fields.
+        """
+        template = {
             "cmd": cmd,
-            "url": url,
             "maxTimeout": max_timeout or self.DEFAULT_TIMEOUT,
         }
         if session_id:
-            payload["session"] = session_id
+            template["session"] = session_id
+        proxy = _normalize_proxy(proxy)
         if proxy:
-            if isinstance(proxy, dict):
-                payload["proxy"] = proxy
-            else:
-                payload["proxy"] = {"url": proxy}
-        if cookies:
-            payload["cookies"] = cookies
+            # Copy it: the caller's dict may change after it is cached.
+            template["proxy"] = dict(proxy)
         if session_ttl_minutes is not None:
-            payload["session_ttl_minutes"] = session_ttl_minutes
+            template["session_ttl_minutes"] = session_ttl_minutes
         if return_only_cookies:
-            payload["returnOnlyCookies"] = True
+            template["returnOnlyCookies"] = True
         if return_screenshot:
-            payload["returnScreenshot"] = True
+            template["returnScreenshot"] = True
         if wait_in_seconds is not None:
-            payload["waitInSeconds"] = wait_in_seconds
+            template["waitInSeconds"] = wait_in_seconds
         if disable_media:
-            payload["disableMedia"] = True
+            template["disableMedia"] = True
         if tabs_till_verify is not None and cmd == "request.get":
-            payload["tabs_till_verify"] = tabs_till_verify
-        if data is not None and cmd == "request.post":
-            if isinstance(data, dict):
-                data = urlencode(data)
-            payload["postData"] = data
-        elif cmd == "request.post":
-            # FlareSolverr requires postData for request.post; send empty string
-            payload["postData"] = ""
-        return self._rpc.send(payload)
+            template["tabs_till_verify"] = tabs_till_verify
+        return template
+
+
+def _normalize_proxy(proxy):
+    """Return *proxy* in FlareSolverr's ``{"url": ...}`` form, or *None*.
+
+    Parameters:
+        proxy (str, dict or None): A proxy URL or an already normalised
+            proxy dict, which is returned unchanged.
+    """
+    if not proxy:
+        return None
+    if isinstance(proxy, dict):
+        return proxy
+    return {"url": proxy}
+
+
+def _encode_post_data(data):
+    """Return *data* as an ``x-www-form-urlencoded`` string.
+
+    Strings are assumed to be encoded already and are returned as-is;
+    bytes are decoded so that the payload stays JSON-serialisable.
+    FlareSolverr requires ``postData`` for ``request.post``, so *None*
+    becomes an empty string.
+    """
+    if data is None:
+        return ""
+    if isinstance(data, dict):
+        return _urlencode(data)
+    if isinstance(data, bytes):
+        return data.decode("utf-8")
+    return data
+
+
+def _cookies_key(cookies):
+    """Return a hashable key for a ``cookies`` payload list.
+
+    Value types are part of the key, see :func:`_urlencode`.
+    """
+    if not cookies:
+        return None
+    return tuple(
+        tuple((k, type(v), v) for k, v in sorted(cookie.items())) for cookie in cookies
+    )
+
+
+def _urlencode(query, doseq=True):
+    """URL-encode the *query* dict, memoising the result.
+
+    Scrapers tend to send the same parameters over and over (pagination
+    keys, fixed filters), so encoded strings are cached by the dict's
+    items.  Each value's type is part of the key, as ``True``, ``1`` and
+    ``1.0`` compare equal but encode differently.  Dicts with unhashable
+    values (e.g. lists) are encoded directly.
+
+    Parameters:
+        query (dict): The fields to encode.
+        doseq (bool): Encode list values as repeated fields, as
+            :func:`urlencode` does.
+    """
+    try:
+        key = (doseq, tuple((k, type(v), v) for k, v in query.items()))
+        encoded = _urlencode_cache.get(key)
+    except TypeError:
+        return urlencode(query, doseq=doseq)
+    if encoded is None:
+        if len(_urlencode_cache) >= _URLENCODE_CACHE_SIZE:
+            _urlencode_cache.clear()
+        encoded = _urlencode_cache[key] = urlencode(query, doseq=doseq)
+    return encoded
+
+
+class _InflightCall(object):
+    """Result holder shared by coalesced :class:`RequestCommand` calls."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+    def wait(self):
+        """Block until the leading call finishes and return a copy of its
+        result, or re-raise its exception."""
+        self.done.wait()
+        if self.exception is not None:
+            raise self.exception
+        # Callers may mutate the dict (e.g. the CLI truncates the body).
+        return copy.deepcopy(self.result)
@@ -1,22 +1,25 @@
 # -*- coding: utf-8 -*-
 
+import codecs
+import re
 import warnings
 
-try:
-    from urllib import urlencode
-except ImportError:
-    from urllib.parse import urlencode
-
 import requests
+from requests.compat import basestring, cookielib
 from requests.structures import CaseInsensitiveDict
 
-from flaresolverr_session.rpc import RPC
+from flaresolverr_session.detection import is_cloudflare_challenge
+from flaresolverr_session.rpc import RPC, _normalize_proxy, _urlencode
 from flaresolverr_session.exceptions import (
     FlareSolverrResponseError,
     FlareSolverrChallengeError,
     FlareSolverrUnsupportedMethodError,
 )
 
+#: Matches FlareSolverr error messages caused by a challenge, CAPTCHA, or
+#: timeout; see :class:`FlareSolverrChallengeError`.
+_CHALLENGE_MESSAGE_RE = re.compile("captcha|timeout|challenge", re.IGNORECASE)
+
 
 class Session(requests.Session):
     """A ``requests.Session`` subclass that routes requests through
@@ -51,7 +54,8 @@ class Session(requests.Session):
 
     DEFAULT_TIMEOUT = 60000
 
-    _SUPPORTED_METHODS = ("GET", "POST")
+    #: Supported HTTP methods and the ``rpc.request`` command serving each.
+    _METHOD_COMMANDS = {"GET": "get", "POST": "post"}
 
     def __init__(
         self, flaresolverr_url=None, session_id=None, proxy=None, timeout=None, rpc=None
@@ -71,9 +75,7 @@ class Session(requests.Session):
         self._rpc = rpc
 
         self._timeout = timeout or self.DEFAULT_TIMEOUT
-        if proxy and not isinstance(proxy, dict):
-            proxy = {"url": proxy}
-        self._proxy = proxy
+        self._proxy = _normalize_proxy(proxy)
         self._session_id = session_id
         self._session_created = False
 
@@ -81,7 +83,13 @@ class Session(requests.Session):
     def session_id(self):
         """The FlareSolverr session identifier."""
         if not self._session_created:
-            self._create_session()
+            if self._session_id is not None and self._proxy is None:
+                # FlareSolverr creates a missing session on its first
+                # request, so a caller-provided id needs no round-trip.
+                # Sessions with a proxy must still be created explicitly.
+                self._session_created = True
+            else:
+                self._create_session()
         return self._session_id
 
     def request(self, method, url, **kwargs):
@@ -110,7 +118,8 @@ class Session(requests.Session):
                 timeout was encountered.
         """
         method = method.upper()
-        if method not in self._SUPPORTED_METHODS:
+        command = self._METHOD_COMMANDS.get(method)
+        if command is None:
             raise FlareSolverrUnsupportedMethodError(
                 "FlareSolverr only supports GET and POST requests. "
                 "Method '%s' is not supported." % method
@@ -124,13 +133,9 @@ class Session(requests.Session):
 
         request_kwargs = self._build_request_kwargs(method, url, **kwargs)
         try:
-            if method == "GET":
-                resp_data = self._rpc.request.get(**request_kwargs)
-            else:
-                resp_data = self._rpc.request.post(**request_kwargs)
+            resp_data = getattr(self._rpc.request, command)(**request_kwargs)
         except FlareSolverrResponseError as e:
-            msg = e.message.lower()
-            if "captcha" in msg or "timeout" in msg or "challenge" in msg:
+            if _CHALLENGE_MESSAGE_RE.search(e.message):
                 raise FlareSolverrChallengeError(
                     e.message, response_data=e.response_data
                 )
@@ -150,11 +155,16 @@ class Session(requests.Session):
         params = kwargs.get("params")
         if params:
             if isinstance(params, dict):
-                encoded_params = urlencode(params)
-                if "?" in url:
-                    url = url + "&" + encoded_params
-                else:
-                    url = url + "?" + encoded_params
+                query = _urlencode(params, doseq=False)
+            elif isinstance(params, bytes):
+                query = params.decode("utf-8")
+            elif isinstance(params, basestring):
+                # Already an encoded query string.
+                query = params
+            else:
+                query = None
+            if query:
+                url = url + ("&" if "?" in url else "?") + query
 
         request_kwargs = {
             "url": url,
@@ -226,6 +236,8 @@ class Response(requests.Response):
             associated with this response.
     """
 
+    __attrs__ = requests.Response.__attrs__ + ["_text", "flaresolverr"]
+
     def __init__(self, flaresolverr_data):
         """Initialize from FlareSolverr JSON response."""
         super(Response, self).__init__()
@@ -239,18 +251,18 @@ class Response(requests.Response):
         content = solution.get("response", "")
         if isinstance(content, bytes):
             self._content = content
+            self._text = None
         else:
-            self._content = content.encode("utf-8")
+            # Encoded on first access of ``content``; ``text`` is served
+            # from the decoded string directly.
+            self._text = content
+        # The whole body is already in memory; there is no raw stream.
+        self._content_consumed = True
         self.encoding = "utf-8"
 
         # Cookies
         for cookie in solution.get("cookies", []):
-            self.cookies.set(
-                cookie.get("name", ""),
-                cookie.get("value", ""),
-                domain=cookie.get("domain", ""),
-                path=cookie.get("path", "/"),
-            )
+            self.cookies.set_cookie(_make_cookie(cookie))
 
         self.flaresolverr = FlareSolverr(
             status=flaresolverr_data.get("status", ""),
@@ -260,3 +272,70 @@ class Response(requests.Response):
             end=flaresolverr_data.get("endTimestamp", 0),
             version=flaresolverr_data.get("version", ""),
         )
+
+    @property
+    def content(self):
+        """Content of the response, in bytes."""
+        if self._content is False:
+            self._content = self._text.encode("utf-8")
+        return self._content
+
+    @property
+    def text(self):
+        """Content of the response, in unicode."""
+        if self._text is not None and self.encoding:
+            try:
+                name = codecs.lookup(self.encoding).name
+            except LookupError:
+                # requests falls back to UTF-8 on Python 3 but ASCII on
+                # Python 2; use UTF-8 everywhere.
+                name = "utf-8"
+            if name == "utf-8":
+                return self._text
+        return super(Response, self).text
+
+    @property
+    def is_cloudflare_challenge(self):
+        """Whether this response is a Cloudflare challenge page.
+
+        Evaluated once per response; see
+        :func:`~flaresolverr_session.detection.is_cloudflare_challenge`.
+        """
+        result = getattr(self, "_is_cloudflare_challenge", None)
+        if result is None:
+            result = self._is_cloudflare_challenge = is_cloudflare_challenge(self)
+        return result
+
+    def iter_content(self, *args, **kwargs):
+        self.content  # Materialise the lazily encoded body.
+        return super(Response, self).iter_content(*args, **kwargs)
+
+
+def _make_cookie(data):
+    """Build a :class:`cookielib.Cookie` from a FlareSolverr cookie dict.
+
+    The cookie is constructed directly rather than through
+    ``RequestsCookieJar.set``, which goes through ``create_cookie``'s
+    keyword handling for every cookie.
+    """
+    domain = data.get("domain", "")
+    path = data.get("path", "/")
+    return cookielib.Cookie(
+        version=0,
+        name=data.get("name", ""),
+        value=data.get("value", ""),
+        port=None,
+        port_specified=False,
+        domain=domain,
+        domain_specified=bool(domain),
+        domain_initial_dot=domain.startswith("."),
+        path=path,
+        path_specified=bool(path),
+        secure=bool(data.get("secure", False)),
+        expires=data.get("expiry"),
+        discard=False,
+        comment=None,
+        comment_url=None,
+        rest={"HttpOnly": None} if data.get("httpOnly") else {},
+        rfc2109=False,
+    )
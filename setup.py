@@ -43,9 +43,17 @@ setup(
         ],
     },
     extras_require={
+        "async": [
+            "aiohttp;python_version>='3.6'",
+        ],
+        "speedups": [
+            "orjson;python_version>='3.8'",
+        ],
         "dev": [
             "pytest",
+            "pytest-xdist;python_version>='3.8'",
             "mock;python_version<'3'",
+            "aiohttp;python_version>='3.8'",
         ],
     },
     classifiers=[
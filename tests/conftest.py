@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+collect_ignore = []
+
+if sys.version_info[0] < 3:
+    # Uses coroutine syntax, which Python 2 can't even compile.
+    collect_ignore.append("test_async_rpc.py")
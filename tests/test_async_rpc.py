@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+try:
+    import asyncio
+    from unittest import mock
+
+    from flaresolverr_session.async_rpc import AsyncRPC
+except (ImportError, SyntaxError):  # Python 2 or aiohttp not installed
+    AsyncRPC = None
+
+from flaresolverr_session import FlareSolverrResponseError
+
+
+def _fake_api_session(data):
+    """Return a mock ``aiohttp.ClientSession`` whose post yields *data*."""
+    api_session = mock.MagicMock()
+    resp = api_session.post.return_value.__aenter__.return_value
+    resp.json = mock.AsyncMock(return_value=data)
+    return api_session
+
+
+@unittest.skipIf(AsyncRPC is None, "aiohttp is not available")
+class TestAsyncRPC(unittest.TestCase):
+    def _run(self, coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def test_send_returns_data(self):
+        """AsyncRPC.send() posts the payload and returns the parsed JSON."""
+        data = {"status": "ok", "sessions": []}
+        api_session = _fake_api_session(data)
+        rpc = AsyncRPC("http://localhost:8191/v1", api_session=api_session)
+
+        result = self._run(rpc.session.list())
+
+        self.assertEqual(result, data)
+        api_session.post.assert_called_once_with(
+            "http://localhost:8191/v1", json={"cmd": "sessions.list"}
+        )
+
+    def test_send_raises_on_error_status(self):
+        """AsyncRPC.send() raises FlareSolverrResponseError when status != 'ok'."""
+        error_data = {"status": "error", "message": "Internal error"}
+        rpc = AsyncRPC(
+            "http://localhost:8191/v1", api_session=_fake_api_session(error_data)
+        )
+
+        with self.assertRaises(FlareSolverrResponseError) as ctx:
+            self._run(rpc.request.get("https://example.com"))
+        self.assertEqual(ctx.exception.message, "Internal error")
+        self.assertEqual(ctx.exception.response_data, error_data)
+
+    def test_get_many(self):
+        """get_many() awaits one request per URL, in input order."""
+        rpc = AsyncRPC("http://localhost:8191/v1")
+        rpc.send = mock.AsyncMock(
+            side_effect=lambda payload: {"status": "ok", "url": payload["url"]}
+        )
+        urls = ["https://example.com/%d" % i for i in range(5)]
+
+        results = self._run(rpc.request.get_many(urls, max_concurrency=2))
+
+        self.assertEqual([r["url"] for r in results], urls)
+        self.assertEqual(rpc.send.await_count, 5)
+
+    def test_identical_gets_not_coalesced(self):
+        """Concurrent identical gets each send their own request."""
+        rpc = AsyncRPC("http://localhost:8191/v1")
+        rpc.send = mock.AsyncMock(return_value={"status": "ok"})
+
+        async def run():
+            return await asyncio.gather(
+                rpc.request.get("https://example.com/"),
+                rpc.request.get("https://example.com/"),
+            )
+
+        results = self._run(run())
+
+        self.assertEqual(results, [{"status": "ok"}, {"status": "ok"}])
+        self.assertEqual(rpc.send.await_count, 2)
+        self.assertEqual(rpc.request._inflight, {})
+
+    def test_close_keeps_external_api_session(self):
+        """close() does not close a user-supplied api session."""
+        api_session = _fake_api_session({"status": "ok"})
+        rpc = AsyncRPC(api_session=api_session)
+
+        self._run(rpc.close())
+
+        api_session.close.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,8 @@
 
 import unittest
 
+from flaresolverr_session import RPC
+
 from .test_rpc import RPCTestCase
 
 
@@ -37,8 +39,19 @@ class ChallengeTestCase(RPCTestCase):
 
     Exercises the full challenge-solving path.  Each test is generated
     from an entry in ``tests.test_challenge.CHALLENGE_SITES``.
+
+    All sites of a class are fetched through one FlareSolverr session, so
+    the headless browser is started once per class instead of per site.
     """
 
+    @classmethod
+    def setUpClass(cls):
+        cls.session_id = RPC().session.create()["session"]
+
+    @classmethod
+    def tearDownClass(cls):
+        RPC().session.destroy(cls.session_id)
+
     def _assert_site_solution(self, result, entry):
         """Assert that a FlareSolverr result satisfies a testconf entry."""
         self._assert_ok(result)
@@ -93,7 +106,7 @@ class TestNoChallengeSites(ChallengeTestCase):
 
 def _make_challenge_site_test(entry):
     def test(self):
-        result = self.rpc.request.get(entry["url"])
+        result = self.rpc.request.get(entry["url"], session_id=self.session_id)
         self._assert_site_solution(result, entry)
         self.assertIn(
             "challenge solved",
@@ -107,7 +120,7 @@ def _make_challenge_site_test(entry):
 
 def _make_no_challenge_site_test(entry):
     def test(self):
-        result = self.rpc.request.get(entry["url"])
+        result = self.rpc.request.get(entry["url"], session_id=self.session_id)
         self._assert_site_solution(result, entry)
         self.assertNotIn(
             "challenge solved",
@@ -7,8 +7,14 @@ methods are invoked with the expected arguments.
 """
 
 import base64
+import contextlib
+import io
 import json
+import os
+import shutil
+import subprocess
 import sys
+import tempfile
 import unittest
 
 try:
@@ -21,7 +27,14 @@ if sys.version_info[0] >= 3:
 else:
     from StringIO import StringIO  # Python 2
 
-from flaresolverr_session.cli import main, _truncate_response_body
+from flaresolverr_session import cli
+from flaresolverr_session.cli import (
+    main,
+    format_output,
+    _truncate_response_body,
+    _write_base64,
+    _write_body,
+)
 from flaresolverr_session import (
     FlareSolverrResponseError,
     FlareSolverrError,
@@ -100,6 +113,21 @@ def _fake_rpc():
     return rpc
 
 
+@contextlib.contextmanager
+def _captured_output():
+    """Redirect ``sys.stdout`` and ``sys.stderr`` to fresh buffers.
+
+    Yields:
+        tuple: (stdout_buffer, stderr_buffer)
+    """
+    old_stdout, old_stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = out, err = StringIO(), StringIO()
+    try:
+        yield out, err
+    finally:
+        sys.stdout, sys.stderr = old_stdout, old_stderr
+
+
 def _run_cli(argv, rpc=None):
     """Run the CLI main() with mocked RPC and capture stdout/stderr.
 
@@ -113,16 +141,9 @@ def _run_cli(argv, rpc=None):
     if rpc is None:
         rpc = _fake_rpc()
 
-    with mock.patch("flaresolverr_session.cli.RPC", return_value=rpc):
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        sys.stdout = captured_out = StringIO()
-        sys.stderr = captured_err = StringIO()
-        try:
+    with mock.patch("flaresolverr_session.rpc.RPC", return_value=rpc):
+        with _captured_output() as (captured_out, captured_err):
             exit_code = main(argv)
-        finally:
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
 
     return exit_code, captured_out.getvalue(), captured_err.getvalue(), rpc
 
@@ -168,13 +189,9 @@ class TestSessionCreate(unittest.TestCase):
     def test_create_with_flaresolverr_url(self):
         """session create with -f flag."""
         rpc = _fake_rpc()
-        with mock.patch("flaresolverr_session.cli.RPC", return_value=rpc) as rpc_cls:
-            old_stdout = sys.stdout
-            sys.stdout = StringIO()
-            try:
+        with mock.patch("flaresolverr_session.rpc.RPC", return_value=rpc) as rpc_cls:
+            with _captured_output():
                 main(["-f", "http://custom:9999/v1", "session", "create", "n1"])
-            finally:
-                sys.stdout = old_stdout
             rpc_cls.assert_called_once_with("http://custom:9999/v1")
 
     def test_create_with_multiple_names(self):
@@ -188,6 +205,18 @@ class TestSessionCreate(unittest.TestCase):
         self.assertIsInstance(data, list)
         self.assertEqual(len(data), 2)
 
+    def test_create_many_keeps_order(self):
+        """Concurrently created sessions are reported in argument order."""
+        names = ["s%d" % i for i in range(10)]
+        rpc = _fake_rpc()
+        rpc.session.create.side_effect = lambda session_id, proxy: {
+            "status": "ok",
+            "session": session_id,
+        }
+        code, out, _err, _ = _run_cli(["session", "create"] + names, rpc=rpc)
+        self.assertEqual(code, 0)
+        self.assertEqual([d["session"] for d in json.loads(out)], names)
+
 
 class TestSessionList(unittest.TestCase):
     """Tests for 'session list' CLI command."""
@@ -228,6 +257,15 @@ class TestSessionClear(unittest.TestCase):
         self.assertIsInstance(data, list)
         self.assertEqual(len(data), 2)
 
+    def test_clear_no_sessions(self):
+        """session clear with no active sessions destroys nothing."""
+        rpc = _fake_rpc()
+        rpc.session.list.return_value = {"status": "ok", "sessions": []}
+        code, out, _err, _ = _run_cli(["session", "clear"], rpc=rpc)
+        self.assertEqual(code, 0)
+        rpc.session.destroy.assert_not_called()
+        self.assertEqual(json.loads(out), [])
+
 
 class TestRequestDefault(unittest.TestCase):
     """Tests for the default request command (URL as first arg)."""
@@ -282,6 +320,11 @@ class TestRequestDefault(unittest.TestCase):
 class TestRequestWithOptions(unittest.TestCase):
     """Tests for request command with various options."""
 
+    def setUp(self):
+        # --screenshot writes the decoded screenshot to the given path.
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
     def test_session_id(self):
         """Request with -s session-id."""
         code, out, _err, rpc = _run_cli(["https://example.com", "-s", "my-session"])
@@ -353,7 +396,7 @@ class TestRequestWithOptions(unittest.TestCase):
     def test_return_screenshot(self):
         """Request with --return-screenshot."""
         code, out, _err, rpc = _run_cli(
-            ["https://example.com", "--screenshot", "s.png"]
+            ["https://example.com", "--screenshot", os.path.join(self.tmpdir, "s.png")]
         )
         self.assertEqual(code, 0)
         rpc.request.get.assert_called_once_with(
@@ -368,6 +411,16 @@ class TestRequestWithOptions(unittest.TestCase):
             "https://example.com", wait_in_seconds=5
         )
 
+    def test_zero_values(self):
+        """An explicit 0 is kept for --wait but not for --timeout."""
+        code, out, _err, rpc = _run_cli(
+            ["https://example.com", "--wait", "0", "-t", "0"]
+        )
+        self.assertEqual(code, 0)
+        rpc.request.get.assert_called_once_with(
+            "https://example.com", wait_in_seconds=0
+        )
+
     def test_disable_media(self):
         """Request with --disable-media."""
         code, out, _err, rpc = _run_cli(["https://example.com", "--disable-media"])
@@ -385,7 +438,7 @@ class TestRequestWithOptions(unittest.TestCase):
                 "15",
                 "--cookies",
                 "--screenshot",
-                "ss.png",
+                os.path.join(self.tmpdir, "ss.png"),
                 "--wait",
                 "3",
                 "--disable-media",
@@ -404,54 +457,57 @@ class TestRequestWithOptions(unittest.TestCase):
     def test_flaresolverr_url_passed_to_rpc(self):
         """The -f flag is forwarded to RPC constructor."""
         rpc = _fake_rpc()
-        with mock.patch("flaresolverr_session.cli.RPC", return_value=rpc) as rpc_cls:
-            old_stdout = sys.stdout
-            sys.stdout = StringIO()
-            try:
+        with mock.patch("flaresolverr_session.rpc.RPC", return_value=rpc) as rpc_cls:
+            with _captured_output():
                 main(["-f", "http://custom:1234/v1", "https://example.com"])
-            finally:
-                sys.stdout = old_stdout
             rpc_cls.assert_called_once_with("http://custom:1234/v1")
 
     def test_flaresolverr_url_with_request_command(self):
         """The -f flag works with explicit request command."""
         rpc = _fake_rpc()
-        with mock.patch("flaresolverr_session.cli.RPC", return_value=rpc) as rpc_cls:
-            old_stdout = sys.stdout
-            sys.stdout = StringIO()
-            try:
+        with mock.patch("flaresolverr_session.rpc.RPC", return_value=rpc) as rpc_cls:
+            with _captured_output():
                 main(["-f", "http://custom:1234/v1", "request", "https://example.com"])
-            finally:
-                sys.stdout = old_stdout
             rpc_cls.assert_called_once_with("http://custom:1234/v1")
 
 
 class TestRequestOutputFile(unittest.TestCase):
     """Tests for -o / --output flag."""
 
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def _read(self, name):
+        with open(os.path.join(self.tmpdir, name), "rb") as f:
+            return f.read()
+
     def test_output_file(self):
         """Response body is written to file."""
-        rpc = _fake_rpc()
-        with mock.patch("flaresolverr_session.cli.RPC", return_value=rpc):
-            m = mock.mock_open()
-            with mock.patch(
-                (
-                    "flaresolverr_session.cli.open"
-                    if sys.version_info[0] >= 3
-                    else "__builtin__.open"
-                ),
-                m,
-            ):
-                old_stdout = sys.stdout
-                sys.stdout = StringIO()
-                try:
-                    main(["https://example.com", "-o", "out.html"])
-                finally:
-                    sys.stdout = old_stdout
-
-        m.assert_called_once_with("out.html", "wb")
+        path = os.path.join(self.tmpdir, "out.html")
+        code, _out, _err, _ = _run_cli(["https://example.com", "-o", path])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(self._read("out.html"), b"<html>Hello</html>")
+
+    def test_output_file_large_body_written_in_chunks(self):
+        """A large body is encoded and written chunk by chunk."""
+        body = u"é" * 70000 + u"end"
+        m = mock.mock_open()
+        with mock.patch(
+            (
+                "flaresolverr_session.cli.open"
+                if sys.version_info[0] >= 3
+                else "__builtin__.open"
+            ),
+            m,
+        ):
+            _write_body("out.html", body, chunk_size=65536)
+
         handle = m()
-        handle.write.assert_called_once_with(b"<html>Hello</html>")
+        self.assertEqual(handle.write.call_count, 2)
+        written = b"".join(c[0][0] for c in handle.write.call_args_list)
+        self.assertEqual(written, body.encode("utf-8"))
 
     def test_screenshot_file(self):
         """Screenshot is written to file when --screenshot is provided."""
@@ -475,26 +531,101 @@ class TestRequestOutputFile(unittest.TestCase):
             "endTimestamp": 200,
         }
 
-        with mock.patch("flaresolverr_session.cli.RPC", return_value=rpc):
-            m = mock.mock_open()
-            with mock.patch(
-                (
-                    "flaresolverr_session.cli.open"
-                    if sys.version_info[0] >= 3
-                    else "__builtin__.open"
-                ),
-                m,
-            ):
-                old_stdout = sys.stdout
-                sys.stdout = StringIO()
-                try:
-                    main(["https://example.com", "--screenshot", "out.png"])
-                finally:
-                    sys.stdout = old_stdout
-
-        m.assert_called_with("out.png", "wb")
+        path = os.path.join(self.tmpdir, "out.png")
+        code, _out, _err, _ = _run_cli(
+            ["https://example.com", "--screenshot", path], rpc=rpc
+        )
+
+        self.assertEqual(code, 0)
+        self.assertEqual(self._read("out.png"), png)
+
+    def test_screenshot_decoded_in_chunks(self):
+        """A large screenshot is decoded and written chunk by chunk."""
+        png = bytes(bytearray(range(256))) * 40
+        b64 = base64.b64encode(png).decode("ascii")
+        m = mock.mock_open()
+        with mock.patch(
+            (
+                "flaresolverr_session.cli.open"
+                if sys.version_info[0] >= 3
+                else "__builtin__.open"
+            ),
+            m,
+        ):
+            _write_base64("out.png", b64, chunk_size=4098)
+
         handle = m()
-        handle.write.assert_called_once_with(png)
+        self.assertEqual(handle.write.call_count, 4)
+        written = b"".join(c[0][0] for c in handle.write.call_args_list)
+        self.assertEqual(written, png)
+
+    def test_screenshot_missing_from_response(self):
+        """No file is written when FlareSolverr returns no screenshot."""
+        rpc = _fake_rpc()
+        del rpc.request.get.return_value["solution"]["screenshot"]
+        path = os.path.join(self.tmpdir, "out.png")
+        code, _out, _err, _ = _run_cli(
+            ["https://example.com", "--screenshot", path], rpc=rpc
+        )
+
+        self.assertEqual(code, 0)
+        self.assertFalse(os.path.exists(path))
+
+
+class TestRequestInputFile(unittest.TestCase):
+    """Tests for requesting every URL of a file with -i/--input-file."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, "w") as f:
+            f.write("https://example.com/1\n\nhttps://example.com/2\n")
+        self.addCleanup(os.remove, self.path)
+
+    def _echo_rpc(self):
+        rpc = _fake_rpc()
+        rpc.request.get.side_effect = lambda url, **kwargs: {
+            "status": "ok",
+            "solution": {"url": url, "response": "x" * 1000},
+        }
+        return rpc
+
+    def test_urls_requested_in_order(self):
+        rpc = self._echo_rpc()
+        code, out, _err, _ = _run_cli(
+            ["request", "-i", self.path, "-s", "sid", "--concurrency", "2"], rpc=rpc
+        )
+        self.assertEqual(code, 0)
+        data = json.loads(out)
+        self.assertEqual(
+            [r["solution"]["url"] for r in data],
+            ["https://example.com/1", "https://example.com/2"],
+        )
+        self.assertIn("...[1000 letters]", data[0]["solution"]["response"])
+        rpc.request.get.assert_any_call("https://example.com/2", session_id="sid")
+
+    def test_failed_url_reported_in_place(self):
+        rpc = self._echo_rpc()
+        error = {"status": "error", "message": "boom"}
+
+        def get(url, **kwargs):
+            if url.endswith("/1"):
+                raise FlareSolverrResponseError("boom", error)
+            return {"status": "ok", "solution": {"url": url}}
+
+        rpc.request.get.side_effect = get
+        code, out, _err, _ = _run_cli(["-i", self.path], rpc=rpc)
+        self.assertEqual(code, 1)
+        data = json.loads(out)
+        self.assertEqual(data[0], error)
+        self.assertEqual(data[1]["status"], "ok")
+
+    def test_url_and_input_file_conflict(self):
+        with self.assertRaises(SystemExit):
+            _run_cli(["https://example.com", "-i", self.path])
+
+    def test_url_required_without_input_file(self):
+        with self.assertRaises(SystemExit):
+            _run_cli(["request"])
 
 
 class TestTruncateResponseBody(unittest.TestCase):
@@ -558,6 +689,43 @@ class TestOutputIsJson(unittest.TestCase):
         data = json.loads(out)
         self.assertIn("...[1000 letters]", data["solution"]["response"])
 
+    def test_format_output_matches_json_dumps(self):
+        data = {"status": "ok", "sessions": ["a", "b"], "nested": {"n": 1}}
+        out = StringIO()
+        format_output(data, file=out)
+        self.assertEqual(out.getvalue(), json.dumps(data, indent=2) + "\n")
+
+    def test_format_output_without_orjson(self):
+        data = {"status": "ok", "sessions": ["a", "b"], "nested": {"n": 1}}
+        out = StringIO()
+        with mock.patch("flaresolverr_session.cli.orjson", None):
+            format_output(data, file=out)
+        self.assertEqual(out.getvalue(), json.dumps(data, indent=2) + "\n")
+
+    def test_format_output_to_binary_buffer(self):
+        raw = io.BytesIO()
+        out = io.TextIOWrapper(raw, encoding="utf-8")
+        out.write(u"before\n")
+        format_output({"status": "ok"}, file=out)
+        out.flush()
+        self.assertEqual(raw.getvalue(), b'before\n{\n  "status": "ok"\n}\n')
+
+    def test_format_output_non_ascii(self):
+        data = {"title": u"caf\u00e9 \u4e2d\u6587", "cookies": [u"\u00fc"]}
+        expected = json.dumps(data, indent=2) + "\n"
+        for orjson_module in (cli.orjson, None):
+            out = StringIO()
+            with mock.patch("flaresolverr_session.cli.orjson", orjson_module):
+                format_output(data, file=out)
+            self.assertEqual(out.getvalue(), expected)
+
+    def test_format_output_uses_text_layer(self):
+        raw = io.BytesIO()
+        out = io.TextIOWrapper(raw, encoding="ascii", newline="\r\n")
+        format_output({"title": u"caf\u00e9"}, file=out)
+        out.flush()
+        self.assertEqual(raw.getvalue(), b'{\r\n  "title": "caf\\u00e9"\r\n}\r\n')
+
 
 class TestTwoPassParsing(unittest.TestCase):
     """Edge cases for the two-pass argument parser."""
@@ -583,69 +751,121 @@ class TestTwoPassParsing(unittest.TestCase):
     def test_f_flag_before_command(self):
         """-f before session command."""
         rpc = _fake_rpc()
-        with mock.patch("flaresolverr_session.cli.RPC", return_value=rpc) as rpc_cls:
-            old_stdout = sys.stdout
-            sys.stdout = StringIO()
-            try:
+        with mock.patch("flaresolverr_session.rpc.RPC", return_value=rpc) as rpc_cls:
+            with _captured_output():
                 main(["-f", "http://srv:8191/v1", "session", "list"])
-            finally:
-                sys.stdout = old_stdout
             rpc_cls.assert_called_once_with("http://srv:8191/v1")
 
     def test_f_flag_before_url(self):
         """-f before URL (implicit request)."""
         rpc = _fake_rpc()
-        with mock.patch("flaresolverr_session.cli.RPC", return_value=rpc) as rpc_cls:
-            old_stdout = sys.stdout
-            sys.stdout = StringIO()
-            try:
+        with mock.patch("flaresolverr_session.rpc.RPC", return_value=rpc) as rpc_cls:
+            with _captured_output():
                 main(["-f", "http://srv:8191/v1", "https://target.com"])
-            finally:
-                sys.stdout = old_stdout
             rpc_cls.assert_called_once_with("http://srv:8191/v1")
             rpc.request.get.assert_called_once_with("https://target.com")
 
     def test_f_flag_after_url(self):
         """-f after URL (implicit request)."""
         rpc = _fake_rpc()
-        with mock.patch("flaresolverr_session.cli.RPC", return_value=rpc) as rpc_cls:
-            old_stdout = sys.stdout
-            sys.stdout = StringIO()
-            try:
+        with mock.patch("flaresolverr_session.rpc.RPC", return_value=rpc) as rpc_cls:
+            with _captured_output():
                 main(["https://target.com", "-f", "http://srv:8191/v1"])
-            finally:
-                sys.stdout = old_stdout
             rpc_cls.assert_called_once_with("http://srv:8191/v1")
             rpc.request.get.assert_called_once_with("https://target.com")
 
+    def test_f_flag_attached_values(self):
+        """``--flaresolverr=URL`` and ``-fURL`` forms are recognised."""
+        for argv in (
+            ["--flaresolverr=http://srv:8191/v1", "https://target.com"],
+            ["https://target.com", "-fhttp://srv:8191/v1"],
+        ):
+            rpc = _fake_rpc()
+            with mock.patch(
+                "flaresolverr_session.rpc.RPC", return_value=rpc
+            ) as rpc_cls:
+                with _captured_output():
+                    main(argv)
+            rpc_cls.assert_called_once_with("http://srv:8191/v1")
+            rpc.request.get.assert_called_once_with("https://target.com")
+
+    def test_f_flag_abbreviations(self):
+        """Unique prefixes of ``--flaresolverr`` are accepted, as in argparse."""
+        for argv in (
+            ["--flare", "http://srv:8191/v1", "https://target.com"],
+            ["https://target.com", "--f=http://srv:8191/v1"],
+            ["session", "list", "--flaresolv", "http://srv:8191/v1"],
+        ):
+            rpc = _fake_rpc()
+            with mock.patch(
+                "flaresolverr_session.rpc.RPC", return_value=rpc
+            ) as rpc_cls:
+                with _captured_output():
+                    main(argv)
+            rpc_cls.assert_called_once_with("http://srv:8191/v1")
+
+    def test_f_flag_missing_value(self):
+        """-f without a URL is a usage error."""
+        with _captured_output(), self.assertRaises(SystemExit) as ctx:
+            main(["https://target.com", "-f"])
+        self.assertEqual(ctx.exception.code, 2)
+
+    def test_env_url_read_per_call(self):
+        """FLARESOLVERR_URL is honoured although parsers are reused."""
+        rpc = _fake_rpc()
+        with mock.patch("flaresolverr_session.rpc.RPC", return_value=rpc) as rpc_cls:
+            with _captured_output():
+                with mock.patch.dict("os.environ"):
+                    os.environ.pop("FLARESOLVERR_URL", None)
+                    main(["session", "list"])
+                    os.environ["FLARESOLVERR_URL"] = "http://env:8191/v1"
+                    main(["session", "list"])
+        self.assertEqual(
+            [c[0][0] for c in rpc_cls.call_args_list],
+            ["http://localhost:8191/v1", "http://env:8191/v1"],
+        )
+
+    def test_parsers_built_once(self):
+        """Repeated main() calls reuse the parsers built by the first."""
+        # Start from an empty cache and restore it afterwards, so the mock
+        # builder's parser doesn't leak into other tests.
+        with mock.patch.dict(cli._parsers, clear=True), mock.patch(
+            "flaresolverr_session.cli._build_request_parser",
+            wraps=cli._build_request_parser,
+        ) as builder:
+            _run_cli(["https://example.com"])
+            _run_cli(["https://example.com", "-m", "POST"])
+        builder.assert_called_once_with()
+
     def test_no_args_shows_help_exit_zero(self):
         """No arguments shows help and exits with code 0."""
-        old_stdout = sys.stdout
-        sys.stdout = StringIO()
-        try:
+        with _captured_output():
             code = main([])
-        finally:
-            sys.stdout = old_stdout
         self.assertEqual(code, 0)
 
+    def test_help_builds_no_parser(self):
+        """Top-level help is printed without building any parser."""
+        with mock.patch(
+            "flaresolverr_session.cli._build_request_parser"
+        ) as request_builder, mock.patch(
+            "flaresolverr_session.cli._build_session_parser"
+        ) as session_builder:
+            code, out, _err, _rpc = _run_cli(["--help"])
+        self.assertEqual(code, 0)
+        self.assertIn("usage: flaresolverr-cli", out)
+        request_builder.assert_not_called()
+        session_builder.assert_not_called()
+
     def test_dash_h_shows_help_exit_zero(self):
         """-h shows help and exits with code 0."""
-        old_stdout = sys.stdout
-        sys.stdout = StringIO()
-        try:
+        with _captured_output():
             code = main(["-h"])
-        finally:
-            sys.stdout = old_stdout
         self.assertEqual(code, 0)
 
     def test_double_dash_help_exit_zero(self):
         """--help shows help and exits with code 0."""
-        old_stdout = sys.stdout
-        sys.stdout = StringIO()
-        try:
+        with _captured_output():
             code = main(["--help"])
-        finally:
-            sys.stdout = old_stdout
         self.assertEqual(code, 0)
 
 
@@ -666,6 +886,16 @@ class TestCliErrorHandling(unittest.TestCase):
         rpc.request.post.side_effect = exc
         return rpc
 
+    def _run_failing(self, argv, rpc):
+        """Run the CLI, expecting it to fail with JSON on stderr.
+
+        Returns:
+            tuple: (stdout_text, parsed_stderr_json)
+        """
+        code, out, err, _ = _run_cli(argv, rpc=rpc)
+        self.assertEqual(code, 1)
+        return out, json.loads(err)
+
     def test_response_error_exits_nonzero(self):
         """FlareSolverrResponseError causes exit code 1."""
         fake_resp = {"status": "error", "message": "Challenge not solved"}
@@ -679,12 +909,10 @@ class TestCliErrorHandling(unittest.TestCase):
         fake_resp = {"status": "error", "message": "Challenge not solved"}
         exc = FlareSolverrResponseError("Challenge not solved", response_data=fake_resp)
         rpc = self._make_rpc_raising(exc)
-        code, out, err, _ = _run_cli(["https://example.com"], rpc=rpc)
-        self.assertEqual(code, 1)
+        out, data = self._run_failing(["https://example.com"], rpc)
         # Stdout should be empty (no normal output)
         self.assertEqual(out.strip(), "")
         # Stderr should contain the JSON response
-        data = json.loads(err)
         self.assertEqual(data["status"], "error")
         self.assertEqual(data["message"], "Challenge not solved")
 
@@ -702,9 +930,7 @@ class TestCliErrorHandling(unittest.TestCase):
         fake_resp = {"status": "error", "message": "Captcha detected"}
         exc = FlareSolverrResponseError("Captcha detected", response_data=fake_resp)
         rpc = self._make_rpc_raising(exc)
-        code, out, err, _ = _run_cli(["https://example.com"], rpc=rpc)
-        self.assertEqual(code, 1)
-        data = json.loads(err)
+        _out, data = self._run_failing(["https://example.com"], rpc)
         self.assertEqual(data["message"], "Captcha detected")
 
     def test_timeout_error_exits_nonzero(self):
@@ -714,9 +940,7 @@ class TestCliErrorHandling(unittest.TestCase):
             "Error: Timeout reached", response_data=fake_resp
         )
         rpc = self._make_rpc_raising(exc)
-        code, out, err, _ = _run_cli(["https://example.com"], rpc=rpc)
-        self.assertEqual(code, 1)
-        data = json.loads(err)
+        _out, data = self._run_failing(["https://example.com"], rpc)
         self.assertIn("Timeout", data["message"])
 
     def test_session_command_error_exits_nonzero(self):
@@ -725,9 +949,7 @@ class TestCliErrorHandling(unittest.TestCase):
         exc = FlareSolverrResponseError("Session not found", response_data=fake_resp)
         rpc = _fake_rpc()
         rpc.session.destroy.side_effect = exc
-        code, out, err, _ = _run_cli(["session", "destroy", "s1"], rpc=rpc)
-        self.assertEqual(code, 1)
-        data = json.loads(err)
+        _out, data = self._run_failing(["session", "destroy", "s1"], rpc)
         self.assertEqual(data["message"], "Session not found")
 
     def test_post_error_exits_nonzero(self):
@@ -736,9 +958,7 @@ class TestCliErrorHandling(unittest.TestCase):
         exc = FlareSolverrResponseError("Challenge not solved", response_data=fake_resp)
         rpc = _fake_rpc()
         rpc.request.post.side_effect = exc
-        code, out, err, _ = _run_cli(["https://example.com", "-d", "foo=bar"], rpc=rpc)
-        self.assertEqual(code, 1)
-        data = json.loads(err)
+        _out, data = self._run_failing(["https://example.com", "-d", "foo=bar"], rpc)
         self.assertEqual(data["status"], "error")
 
     def test_stderr_is_json_with_full_response(self):
@@ -752,9 +972,7 @@ class TestCliErrorHandling(unittest.TestCase):
         }
         exc = FlareSolverrResponseError("Challenge not solved", response_data=fake_resp)
         rpc = self._make_rpc_raising(exc)
-        code, out, err, _ = _run_cli(["https://example.com"], rpc=rpc)
-        self.assertEqual(code, 1)
-        data = json.loads(err)
+        _out, data = self._run_failing(["https://example.com"], rpc)
         self.assertEqual(data["version"], "3.3.21")
         self.assertEqual(data["startTimestamp"], 100)
         self.assertEqual(data["endTimestamp"], 200)
@@ -768,6 +986,27 @@ class TestCliErrorHandling(unittest.TestCase):
         self.assertEqual(out.strip(), "")
 
 
+@unittest.skipIf(sys.version_info < (3, 7), "lazy imports require Python 3.7")
+class TestCliImports(unittest.TestCase):
+    def test_help_does_not_import_requests(self):
+        """``--help`` and usage errors never import requests."""
+        code = (
+            "import sys\n"
+            "from flaresolverr_session import cli\n"
+            "for argv in (['--help'], ['request', '--help'], ['request']):\n"
+            "    try:\n"
+            "        cli.main(argv)\n"
+            "    except SystemExit:\n"
+            "        pass\n"
+            "sys.exit('requests' in sys.modules)\n"
+        )
+        with open(os.devnull, "w") as devnull:
+            returncode = subprocess.call(
+                [sys.executable, "-c", code], stdout=devnull, stderr=devnull
+            )
+        self.assertEqual(returncode, 0)
+
+
 class TestCliArgumentsBeforeUrl(unittest.TestCase):
     def test_arguments_before_url(self):
         """``--proxy http://p:80 https://example.com`` works."""
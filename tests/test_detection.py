@@ -5,6 +5,11 @@ import io
 import os
 import unittest
 
+try:
+    from unittest import mock
+except ImportError:
+    import mock  # Python 2 back-port
+
 try:
     import http.client as http_client
 except ImportError:
@@ -13,7 +18,8 @@ except ImportError:
 from requests import Response
 from requests.structures import CaseInsensitiveDict
 
-from flaresolverr_session.detection import is_cloudflare_challenge
+from flaresolverr_session import detection
+from flaresolverr_session.detection import SCAN_WINDOW, is_cloudflare_challenge
 
 _DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 _POSITIVE_DIR = os.path.join(_DATA_DIR, "challenge_positive")
@@ -80,6 +86,41 @@ def _make_negative_test(path):
     return test
 
 
+class TestChallengeDetectionBytes(unittest.TestCase):
+    def _response(self, body):
+        resp = Response()
+        resp.status_code = 503
+        resp._content = body
+        return resp
+
+    def test_body_not_decoded(self):
+        """Detection works on the raw bytes without decoding the body."""
+        resp = self._response(
+            b"<html><head><title>Just a moment...</title></head>\xff</html>"
+        )
+        with mock.patch.object(
+            Response, "text", new_callable=mock.PropertyMock
+        ) as text:
+            self.assertTrue(is_cloudflare_challenge(resp))
+        text.assert_not_called()
+
+    def test_non_utf8_body(self):
+        resp = self._response(
+            u"<title>Caf\xe9</title><div id='cf-please-wait'>".encode("latin-1")
+        )
+        self.assertTrue(is_cloudflare_challenge(resp))
+
+    def test_markers_past_scan_window_ignored(self):
+        padding = b" " * SCAN_WINDOW
+        resp = self._response(b"<html>" + padding + b"<div id='cf-please-wait'>")
+        self.assertFalse(is_cloudflare_challenge(resp))
+
+    def test_patterns_compiled_once(self):
+        with mock.patch.object(detection, "_PATTERNS", None):
+            patterns = detection._get_patterns()
+            self.assertIs(detection._get_patterns(), patterns)
+
+
 for _path in sorted(glob.glob(os.path.join(_POSITIVE_DIR, "*.html"))):
     _name = "test_" + os.path.splitext(os.path.basename(_path))[0]
     setattr(TestChallengeDetectionPositive, _name, _make_positive_test(_path))
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import json
+import threading
 import time
 import unittest
+import uuid
 
 try:
     from unittest import mock
@@ -9,8 +12,10 @@ except ImportError:
     import mock  # Python 2 back-port
 
 import requests
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, SSLError
 
 from flaresolverr_session import RPC, FlareSolverrResponseError
+from flaresolverr_session.rpc import _urlencode
 
 try:
     string_types = basestring  # Python 2
@@ -69,7 +74,9 @@ class TestSessionCreate(RPCTestCase):
 
     def test_create_with_explicit_id(self):
         """session.create(session_id=...) honours the requested id."""
-        sid = "test-rpc-explicit-session"
+        # Unique per run, so parallel workers sharing one FlareSolverr
+        # instance never collide on the id.
+        sid = "test-rpc-explicit-session-%s" % uuid.uuid4().hex
         result = self.rpc.session.create(session_id=sid)
         self._assert_ok(result)
         self.assertEqual(
@@ -294,7 +301,7 @@ class TestRPCErrorHandling(unittest.TestCase):
             "version": "0.0.0",
         }
         mock_resp = mock.MagicMock()
-        mock_resp.json.return_value = error_data
+        mock_resp.content = json.dumps(error_data).encode("utf-8")
 
         rpc = RPC("http://localhost:8191/v1")
         rpc._api_session = mock.MagicMock()
@@ -306,5 +313,289 @@ class TestRPCErrorHandling(unittest.TestCase):
         self.assertEqual(ctx.exception.response_data, error_data)
 
 
+class TestRequestPayload(unittest.TestCase):
+    def setUp(self):
+        self.rpc = RPC("http://localhost:8191/v1")
+        self.rpc.send = mock.MagicMock(return_value={"status": "ok"})
+
+    def _payloads(self):
+        return [c[0][0] for c in self.rpc.send.call_args_list]
+
+    def test_repeated_options_build_fresh_payloads(self):
+        """Requests sharing options get independent payloads."""
+        self.rpc.request.get("https://example.com/1", session_id="s", proxy="http://p")
+        self.rpc.request.get(
+            "https://example.com/2",
+            session_id="s",
+            proxy="http://p",
+            cookies=[{"name": "a", "value": "1"}],
+        )
+        first, second = self._payloads()
+        self.assertEqual(
+            first,
+            {
+                "cmd": "request.get",
+                "url": "https://example.com/1",
+                "maxTimeout": 60000,
+                "session": "s",
+                "proxy": {"url": "http://p"},
+            },
+        )
+        self.assertEqual(second["url"], "https://example.com/2")
+        self.assertEqual(second["cookies"], [{"name": "a", "value": "1"}])
+        self.assertNotIn("cookies", first)
+
+    def test_cached_template_copies_proxy_dict(self):
+        """Mutating a proxy dict after a request doesn't leak into later ones."""
+        proxy = {"url": "http://a:1"}
+        self.rpc.request.get("https://example.com/1", proxy=proxy)
+        proxy["url"] = "http://b:2"
+        self.rpc.request.get("https://example.com/2", proxy={"url": "http://a:1"})
+        first, second = self._payloads()
+        self.assertEqual(first["proxy"], {"url": "http://a:1"})
+        self.assertEqual(second["proxy"], {"url": "http://a:1"})
+
+    def test_post_payload(self):
+        """POST payloads carry encoded postData on top of the template."""
+        self.rpc.request.post("https://example.com/", data={"a": "1"})
+        self.rpc.request.post("https://example.com/")
+        first, second = self._payloads()
+        self.assertEqual(first["cmd"], "request.post")
+        self.assertEqual(first["postData"], "a=1")
+        self.assertEqual(second["postData"], "")
+
+    def test_post_dict_list_values_repeated(self):
+        """List values in a dict body become repeated form fields."""
+        self.rpc.request.post("https://example.com/", data={"a": ["1", "2"]})
+        self.assertEqual(self._payloads()[0]["postData"], "a=1&a=2")
+
+    def test_post_tuple_values_cached_apart_from_params(self):
+        """Query strings (no doseq) and form bodies don't share cache entries."""
+        self.assertEqual(_urlencode({"a": (1, 2)}, doseq=False), "a=%281%2C+2%29")
+        self.rpc.request.post("https://example.com/", data={"a": (1, 2)})
+        self.assertEqual(self._payloads()[0]["postData"], "a=1&a=2")
+
+    def test_post_dict_values_of_equal_hash_not_confused(self):
+        """True, 1 and 1.0 are encoded separately despite comparing equal."""
+        for value, expected in ((True, "a=True"), (1, "a=1"), (1.0, "a=1.0")):
+            self.rpc.request.post("https://example.com/", data={"a": value})
+            self.assertEqual(self._payloads()[-1]["postData"], expected)
+
+    def test_post_string_passed_through(self):
+        """A pre-encoded string body is sent unchanged."""
+        self.rpc.request.post("https://example.com/", data="a=1&b=%20")
+        self.assertEqual(self._payloads()[0]["postData"], "a=1&b=%20")
+
+    def test_post_bytes_decoded(self):
+        """A bytes body is sent as the equivalent string."""
+        self.rpc.request.post("https://example.com/", data=b"a=1&b=%20")
+        self.assertEqual(self._payloads()[0]["postData"], u"a=1&b=%20")
+
+    def test_template_cache_bounded(self):
+        """The template cache never grows beyond MAX_TEMPLATES."""
+        for i in range(self.rpc.request.MAX_TEMPLATES + 5):
+            self.rpc.request.get("https://example.com/", session_id="s%d" % i)
+        self.assertLessEqual(
+            len(self.rpc.request._templates), self.rpc.request.MAX_TEMPLATES
+        )
+
+
+class TestRequestCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.rpc = RPC("http://localhost:8191/v1")
+        self.rpc.send = mock.MagicMock(side_effect=self._slow_send)
+
+    def _slow_send(self, payload):
+        self.release.wait(5)
+        return {"status": "ok", "solution": {"url": payload["url"]}}
+
+    def _get_in_threads(self, urls, cmd="get"):
+        results = [None] * len(urls)
+
+        def worker(i, url):
+            results[i] = getattr(self.rpc.request, cmd)(url)
+
+        threads = [
+            threading.Thread(target=worker, args=(i, url)) for i, url in enumerate(urls)
+        ]
+        for t in threads:
+            t.start()
+        # Give every thread a chance to register before the leader returns.
+        time.sleep(0.1)
+        self.release.set()
+        for t in threads:
+            t.join(5)
+        return results
+
+    def test_identical_gets_share_one_call(self):
+        """Concurrent identical GETs reach FlareSolverr only once."""
+        results = self._get_in_threads(["https://example.com/"] * 3)
+        self.assertEqual(self.rpc.send.call_count, 1)
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[1], results[2])
+        self.assertIsNot(results[0], results[1])
+
+    def test_shared_result_never_handed_out(self):
+        """Every caller, the leader included, gets its own copy."""
+        sent = []
+
+        def send(payload):
+            sent.append(self._slow_send(payload))
+            return sent[-1]
+
+        self.rpc.send.side_effect = send
+        results = self._get_in_threads(["https://example.com/"] * 3)
+        self.assertEqual(len(sent), 1)
+        for result in results:
+            self.assertEqual(result, sent[0])
+            self.assertIsNot(result, sent[0])
+            self.assertIsNot(result["solution"], sent[0]["solution"])
+
+    def test_different_gets_not_coalesced(self):
+        """GETs for different URLs are sent separately."""
+        self._get_in_threads(["https://example.com/1", "https://example.com/2"])
+        self.assertEqual(self.rpc.send.call_count, 2)
+
+    def test_different_cookies_not_coalesced(self):
+        """GETs differing only in cookies are sent separately."""
+        results = [None] * 2
+
+        def worker(i, value):
+            results[i] = self.rpc.request.get(
+                "https://example.com/", cookies=[{"name": "a", "value": value}]
+            )
+
+        threads = [
+            threading.Thread(target=worker, args=(i, v))
+            for i, v in enumerate(("1", "2"))
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        self.release.set()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(self.rpc.send.call_count, 2)
+
+    def test_key_built_without_serialising(self):
+        """The coalescing key does not serialise the payload."""
+        self.release.set()
+        with mock.patch("json.dumps") as dumps:
+            self.rpc.request.get(
+                "https://example.com/", cookies=[{"name": "a", "value": "1"}]
+            )
+        dumps.assert_not_called()
+
+    def test_posts_not_coalesced(self):
+        """POSTs are never coalesced."""
+        self._get_in_threads(["https://example.com/"] * 2, cmd="post")
+        self.assertEqual(self.rpc.send.call_count, 2)
+
+    def test_error_shared_with_waiters(self):
+        """An error from the leading call is raised in every waiter."""
+        error = FlareSolverrResponseError("boom", {"status": "error"})
+
+        def failing_send(payload):
+            self.release.wait(5)
+            raise error
+
+        self.rpc.send.side_effect = failing_send
+        errors = []
+
+        def worker():
+            try:
+                self.rpc.request.get("https://example.com/")
+            except FlareSolverrResponseError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        self.release.set()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(self.rpc.send.call_count, 1)
+        self.assertEqual(errors, [error, error])
+        self.assertEqual(self.rpc.request._inflight, {})
+
+
+class TestRequestGetMany(unittest.TestCase):
+    def setUp(self):
+        self.rpc = RPC("http://localhost:8191/v1")
+        self.rpc.send = mock.MagicMock(
+            side_effect=lambda payload: {"status": "ok", "url": payload["url"]}
+        )
+
+    def test_results_in_url_order(self):
+        """get_many() returns one result per URL, in input order."""
+        urls = ["https://example.com/%d" % i for i in range(20)]
+        results = self.rpc.request.get_many(urls, max_concurrency=4)
+        self.assertEqual([r["url"] for r in results], urls)
+        self.assertEqual(self.rpc.send.call_count, 20)
+
+    def test_common_kwargs_forwarded(self):
+        """Shared options are applied to every request."""
+        self.rpc.request.get_many(
+            ["https://example.com/1", "https://example.com/2"], session_id="s"
+        )
+        for call in self.rpc.send.call_args_list:
+            self.assertEqual(call[0][0]["session"], "s")
+
+    def test_empty(self):
+        """get_many() with no URLs sends nothing."""
+        self.assertEqual(self.rpc.request.get_many([]), [])
+        self.rpc.send.assert_not_called()
+
+    def test_error_propagates(self):
+        """An error from any request is raised from get_many()."""
+        self.rpc.send.side_effect = FlareSolverrResponseError("boom", {})
+        with self.assertRaises(FlareSolverrResponseError):
+            self.rpc.request.get_many(["https://example.com/"])
+
+
+class TestRPCConnectionPool(unittest.TestCase):
+    def test_default_session_pool_size(self):
+        """The internal api session keeps a large keep-alive pool."""
+        rpc = RPC("http://localhost:8191/v1")
+        for prefix in ("http://", "https://"):
+            adapter = rpc._api_session.get_adapter(prefix + "localhost")
+            self.assertEqual(adapter._pool_maxsize, RPC.POOL_MAXSIZE)
+
+    def test_default_session_retries_connect_errors_only(self):
+        """Only connection failures are retried by the internal api session."""
+        rpc = RPC("http://localhost:8191/v1")
+        retries = rpc._api_session.get_adapter("http://localhost").max_retries
+        self.assertEqual(retries.connect, RPC.CONNECT_RETRIES)
+        self.assertEqual(retries.read, 0)
+        self.assertEqual(retries.status, 0)
+
+    def test_default_session_does_not_retry_other_errors(self):
+        """Errors other than connect failures (e.g. SSL) are not retried."""
+        rpc = RPC("http://localhost:8191/v1")
+        retries = rpc._api_session.get_adapter("http://localhost").max_retries
+        with self.assertRaises(MaxRetryError):
+            retries.increment("POST", "/v1", error=SSLError("wrong version"))
+
+    def test_default_session_connect_retries_bounded(self):
+        """Connect failures are retried CONNECT_RETRIES times, then raised."""
+        rpc = RPC("http://localhost:8191/v1")
+        retries = rpc._api_session.get_adapter("http://localhost").max_retries
+        error = ConnectTimeoutError("timed out")
+        for _ in range(RPC.CONNECT_RETRIES):
+            retries = retries.increment("POST", "/v1", error=error)
+        with self.assertRaises(MaxRetryError):
+            retries.increment("POST", "/v1", error=error)
+
+    def test_custom_api_session_untouched(self):
+        """A user-supplied api session is used as-is."""
+        session = requests.Session()
+        adapter = session.get_adapter("http://localhost")
+        rpc = RPC("http://localhost:8191/v1", api_session=session)
+        self.assertIs(rpc._api_session, session)
+        self.assertIs(session.get_adapter("http://localhost"), adapter)
+
+
 if __name__ == "__main__":
     unittest.main()
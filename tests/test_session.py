@@ -297,6 +297,23 @@ class TestSessionLifecycle(unittest.TestCase):
         session.close()
         rpc.session.destroy.assert_called_once_with("explicit-id")
 
+    def test_given_session_id_not_created(self):
+        """An explicit session_id is used without a session.create call."""
+        rpc = _make_mock_rpc(session_id="explicit-id")
+        with Session(rpc=rpc, session_id="explicit-id") as session:
+            session.get("https://example.com/")
+        rpc.session.create.assert_not_called()
+        self.assertEqual(rpc.request.get.call_args[1]["session_id"], "explicit-id")
+
+    def test_given_session_id_with_proxy_created(self):
+        """A session needing a proxy is still created explicitly."""
+        rpc = _make_mock_rpc(session_id="explicit-id")
+        with Session(rpc=rpc, session_id="explicit-id", proxy="http://p") as session:
+            session.get("https://example.com/")
+        rpc.session.create.assert_called_once_with(
+            session_id="explicit-id", proxy={"url": "http://p"}
+        )
+
 
 class TestAutoSession(unittest.TestCase):
     """When no session_id is given, one is returned by rpc.session.create."""
@@ -438,6 +455,45 @@ class TestURLParams(unittest.TestCase):
         self.assertIn("new=2", url)
         self.assertIn("&", url)
 
+    def test_params_list_values_not_repeated(self):
+        """List values in params are encoded as a single field."""
+        rpc = _make_mock_rpc()
+        with _make_session(rpc=rpc) as session:
+            session.get("https://example.com/get", params={"a": (1, 2)})
+            session.get("https://example.com/get", params={"a": [1, 2]})
+        urls = [c[1]["url"] for c in rpc.request.get.call_args_list]
+        self.assertEqual(
+            urls,
+            [
+                "https://example.com/get?a=%281%2C+2%29",
+                "https://example.com/get?a=%5B1%2C+2%5D",
+            ],
+        )
+
+    def test_repeated_params_encoded_identically(self):
+        """Encoding the same params twice yields the same URL."""
+        rpc = _make_mock_rpc()
+        with _make_session(rpc=rpc) as session:
+            for _ in range(2):
+                session.get("https://example.com/get", params={"z": "1", "a": "2"})
+        first, second = [c[1]["url"] for c in rpc.request.get.call_args_list]
+        self.assertEqual(first, second)
+        self.assertIn("z=1", first)
+        self.assertIn("a=2", first)
+
+    def test_params_string_appended(self):
+        """A pre-encoded query string is appended unchanged."""
+        rpc = _make_mock_rpc()
+        with _make_session(rpc=rpc) as session:
+            session.get("https://example.com/get?x=1", params="a=1&b=%20")
+        self.assertEqual(self._get_url(rpc), "https://example.com/get?x=1&a=1&b=%20")
+
+    def test_params_bytes_appended(self):
+        rpc = _make_mock_rpc()
+        with _make_session(rpc=rpc) as session:
+            session.get("https://example.com/get", params=b"a=1")
+        self.assertEqual(self._get_url(rpc), "https://example.com/get?a=1")
+
     def test_no_params_url_unchanged(self):
         """URL is passed through unchanged when no params given."""
         rpc = _make_mock_rpc()
@@ -491,6 +547,87 @@ class TestResponseBuilding(unittest.TestCase):
         self.assertEqual(resp.flaresolverr.version, "1.2.3")
         self.assertEqual(resp.cookies.get("a"), "1")
 
+    def test_cookie_attributes(self):
+        resp = Response(
+            {
+                "solution": {
+                    "cookies": [
+                        {
+                            "name": "cf_clearance",
+                            "value": "x",
+                            "domain": ".example.com",
+                            "path": "/",
+                            "secure": True,
+                            "httpOnly": True,
+                            "expiry": 1893456000.5,
+                        }
+                    ]
+                }
+            }
+        )
+        (cookie,) = list(resp.cookies)
+        self.assertEqual(cookie.domain, ".example.com")
+        self.assertTrue(cookie.domain_initial_dot)
+        self.assertTrue(cookie.secure)
+        self.assertEqual(cookie.expires, 1893456000)
+        self.assertTrue(cookie.has_nonstandard_attr("HttpOnly"))
+
+    def test_body_text_and_content(self):
+        resp = Response({"solution": {"response": u"café"}})
+        self.assertEqual(resp.text, u"café")
+        self.assertEqual(resp.content, u"café".encode("utf-8"))
+
+    def test_body_text_honours_encoding_override(self):
+        resp = Response({"solution": {"response": u"café"}})
+        resp.encoding = "latin-1"
+        self.assertEqual(resp.text, u"cafÃ©")
+
+    def test_body_text_with_unknown_encoding(self):
+        resp = Response({"solution": {"response": u"café"}})
+        resp.encoding = "bogus"
+        self.assertEqual(resp.text, u"café")
+
+    def test_iter_content(self):
+        resp = Response({"solution": {"response": u"abcdef"}})
+        self.assertEqual(list(resp.iter_content(4)), [b"abcd", b"ef"])
+
+    def test_close_without_raw(self):
+        resp = Response({"solution": {"response": u"abc"}})
+        resp.close()
+
+    def test_pickle_round_trip(self):
+        import pickle
+
+        resp = Response({"status": "ok", "solution": {"response": u"abc"}})
+        restored = pickle.loads(pickle.dumps(resp))
+        self.assertEqual(restored.text, u"abc")
+        self.assertEqual(restored.content, b"abc")
+        self.assertEqual(restored.flaresolverr.status, "ok")
+
+    def test_is_cloudflare_challenge(self):
+        resp = Response(
+            {
+                "solution": {
+                    "status": 403,
+                    "headers": {"Content-Type": "text/html"},
+                    "response": "<title>Just a moment...</title>",
+                }
+            }
+        )
+        self.assertTrue(resp.is_cloudflare_challenge)
+        self.assertFalse(
+            Response({"solution": {"response": "ok"}}).is_cloudflare_challenge
+        )
+
+    def test_is_cloudflare_challenge_evaluated_once(self):
+        resp = Response({"solution": {"status": 403, "response": "<html></html>"}})
+        with mock.patch(
+            "flaresolverr_session.session.is_cloudflare_challenge", return_value=False
+        ) as detect:
+            self.assertFalse(resp.is_cloudflare_challenge)
+            self.assertFalse(resp.is_cloudflare_challenge)
+        detect.assert_called_once_with(resp)
+
 
 class TestExceptionHierarchy(unittest.TestCase):
     """Ensure exception classes have the correct inheritance."""